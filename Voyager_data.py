@@ -28,4 +28,64 @@ VOYAGER_EVENTS = [
     {"year": 2015, "event": "Interstellar Cruise", "coords": (2.0e10, 2.5e9, 1.2e9)},
     {"year": 2020, "event": "Interstellar Cruise", "coords": (2.2e10, 2.8e9, 1.4e9)},
     {"year": 2025, "event": "Current Position", "coords": (2.4e10, 3e9, 1.5e9)},
-]
\ No newline at end of file
+]
+
+# === Companion Spacecraft (approximate heliocentric waypoints, km) ===
+VOYAGER_2_EVENTS = [
+    {"year": 1977, "event": "Launch", "coords": (0, 0, 0)},
+    {"year": 1979, "event": "Jupiter Flyby", "coords": (7.6e8, -1.5e8, 0)},
+    {"year": 1981, "event": "Saturn Flyby", "coords": (1.35e9, -5e8, -2e7)},
+    {"year": 1986, "event": "Uranus Flyby", "coords": (2.5e9, -1.7e9, -1e8)},
+    {"year": 1989, "event": "Neptune Flyby", "coords": (3.5e9, -2.8e9, -3e8)},
+    {"year": 1995, "event": "Interplanetary Cruise", "coords": (5.5e9, -4e9, -1.5e9)},
+    {"year": 2007, "event": "Heliosheath Entry", "coords": (8.5e9, -5.5e9, -4e9)},
+    {"year": 2018, "event": "Entered Interstellar Space", "coords": (1.2e10, -7e9, -6.5e9)},
+    {"year": 2025, "event": "Current Position", "coords": (1.4e10, -8e9, -8e9)},
+]
+
+PIONEER_10_EVENTS = [
+    {"year": 1972, "event": "Launch", "coords": (0, 0, 0)},
+    {"year": 1973, "event": "Jupiter Flyby", "coords": (-3e8, 7e8, 1e7)},
+    {"year": 1983, "event": "Crossed Neptune's Orbit", "coords": (-2e9, 4e9, 1.5e8)},
+    {"year": 1997, "event": "End of Science Mission", "coords": (-4.5e9, 9.2e9, 4e8)},
+    {"year": 2003, "event": "Last Signal", "coords": (-5.5e9, 1.1e10, 5e8)},
+    {"year": 2025, "event": "Estimated Position", "coords": (-9e9, 1.8e10, 8e8)},
+]
+
+PIONEER_11_EVENTS = [
+    {"year": 1973, "event": "Launch", "coords": (0, 0, 0)},
+    {"year": 1974, "event": "Jupiter Flyby", "coords": (5e8, 5.5e8, 2e7)},
+    {"year": 1979, "event": "Saturn Flyby", "coords": (-6e8, 1.3e9, 1.5e8)},
+    {"year": 1990, "event": "Crossed Neptune's Orbit", "coords": (-3e9, 3.5e9, 7e8)},
+    {"year": 1995, "event": "Last Contact", "coords": (-4.2e9, 4.8e9, 1e9)},
+    {"year": 2025, "event": "Estimated Position", "coords": (-1.1e10, 1.2e10, 3e9)},
+]
+
+NEW_HORIZONS_EVENTS = [
+    {"year": 2006, "event": "Launch", "coords": (0, 0, 0)},
+    {"year": 2007, "event": "Jupiter Flyby", "coords": (4e8, -6e8, 0)},
+    {"year": 2015, "event": "Pluto Flyby", "coords": (1.5e9, -4.7e9, 5e7)},
+    {"year": 2019, "event": "Arrokoth Flyby", "coords": (2e9, -6.3e9, 1e8)},
+    {"year": 2025, "event": "Kuiper Belt Cruise", "coords": (2.6e9, -8.4e9, 1.5e8)},
+]
+
+# Every tracked craft by name; Voyager 1 is the primary craft of the viewer
+SPACECRAFT = {
+    "Voyager 1": VOYAGER_EVENTS,
+    "Voyager 2": VOYAGER_2_EVENTS,
+    "Pioneer 10": PIONEER_10_EVENTS,
+    "Pioneer 11": PIONEER_11_EVENTS,
+    "New Horizons": NEW_HORIZONS_EVENTS,
+}
+
+def load_events(path=None, cache_dir=None):
+    """Return ``VOYAGER_EVENTS``, or an event view over an ephemeris file if a path is given."""
+    if path is None:
+        return VOYAGER_EVENTS
+    from voyager_ephemeris import load_ephemeris
+    return load_ephemeris(path, cache_dir=cache_dir)
+
+
+def companion_craft():
+    """Every tracked craft except Voyager 1, by name."""
+    return {name: events for name, events in SPACECRAFT.items() if events is not VOYAGER_EVENTS}
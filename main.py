@@ -1,10 +1,36 @@
 # main.py
+import argparse
 import sys
-from PyQt5.QtWidgets import QApplication, QMainWindow
-from voyager_ui import MainWindow
+from voyager_startup import StartupTimer
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = MainWindow()
+    startup = StartupTimer()
+    parser = argparse.ArgumentParser(description="Voyager interactive path viewer")
+    parser.add_argument("--data", help="CSV ephemeris (time, x, y, z[, event]) to view instead of the built-in events")
+    parser.add_argument("--cache-dir", help="Directory for the binary ephemeris cache (default: next to the data file)")
+    parser.add_argument("--propagate", action="store_true",
+                        help="Replace straight legs between waypoints with an hourly N-body propagation")
+    parser.add_argument("--profile", action="store_true", help="Show the frame-time HUD from startup")
+    parser.add_argument("--trace", help="Record frame timings and write them to this CSV/JSON file on exit")
+    parser.add_argument("--stream", help="Live feed to follow: tcp://HOST:PORT, a file or named pipe, or - for stdin")
+    parser.add_argument("--stream-window", type=int, default=50_000, help="Live samples kept on screen (default: 50000)")
+    parser.add_argument("--startup-report", action="store_true", help="Print a startup time breakdown to stderr")
+    args, qt_args = parser.parse_known_args()
+
+    # Only Qt is loaded before the window appears; NumPy and matplotlib follow once it has painted
+    from PyQt5.QtWidgets import QApplication
+    from voyager_ui import MainWindow
+    startup.mark("import Qt")
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    startup.mark("QApplication")
+    window = MainWindow(
+        profile=args.profile, trace_path=args.trace, startup=startup,
+        stream=args.stream, stream_window=args.stream_window,
+    )
+    if args.startup_report:
+        window.ready.connect(lambda: print(startup.report(), file=sys.stderr))
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    if args.data or args.propagate:
+        window.load_dataset(args.data, cache_dir=args.cache_dir, propagate=args.propagate)
+    sys.exit(app.exec_())
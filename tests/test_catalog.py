@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+
+from voyager_catalog import EventCatalog, parse_query
+
+EVENTS = [
+    {"year": 1977, "event": "Launch", "coords": (0.0, 0.0, 0.0)},
+    {"year": 1979, "event": "Jupiter Flyby", "coords": (7.78e8, 0.0, 0.0)},
+    {"year": 1980, "event": "Saturn Flyby", "coords": (1.43e9, 5e7, 0.0)},
+    {"year": 1990, "event": "Family Portrait", "coords": (6e9, 1e9, 0.0)},
+    {"year": 1985, "event": "Cruise", "coords": (3e9, 2e8, 0.0)},
+    {"year": 1986, "event": "Cruise", "coords": (3.5e9, 2.5e8, 0.0)},
+    {"year": 2012, "event": "Entered Interstellar Space", "coords": (1.8e10, 2e9, 0.0)},
+]
+
+
+@pytest.fixture
+def catalog():
+    return EventCatalog(EVENTS)
+
+
+def years(catalog, rows):
+    return [catalog.events[i]["year"] for i in rows]
+
+
+# === parse_query ===
+def test_parse_range_within_and_words():
+    query = parse_query("1979-1990 within 5e9 flyby")
+    assert query == {"text": "flyby", "start": 1979.0, "end": 1991.0, "within": 5e9, "year": None}
+
+
+@pytest.mark.parametrize("text", ["1979 to 1990", "1990..1979", "1979 – 1990"])
+def test_parse_range_separators_and_order(text):
+    query = parse_query(text)
+    assert (query["start"], query["end"], query["text"]) == (1979.0, 1991.0, None)
+
+
+def test_parse_decimal_range_end_is_exclusive():
+    query = parse_query("1979.5-1980.25")
+    assert (query["start"], query["end"]) == (1979.5, 1980.25)
+
+
+@pytest.mark.parametrize("text, within", [
+    ("within 5e9", 5e9),
+    ("within 5e+9 flyby", 5e9),
+    ("within 5E9 km", 5e9),
+    ("within 2.5e-3", 2.5e-3),
+    ("WITHIN 1000", 1000.0),
+])
+def test_parse_within_exponents(text, within):
+    query = parse_query(text)
+    assert query["within"] == within
+    assert query["text"] in (None, "flyby")
+
+
+def test_parse_lone_whole_year_is_also_a_range():
+    query = parse_query("1990")
+    assert (query["year"], query["start"], query["end"], query["text"]) == (1990, 1990.0, 1991.0, None)
+
+
+def test_parse_lone_decimal_year_is_only_a_position():
+    query = parse_query("1990.5")
+    assert (query["year"], query["start"], query["end"]) == (1990.5, None, None)
+
+
+def test_parse_words_only():
+    assert parse_query("  Jupiter, flyby! ") == {
+        "text": "Jupiter flyby", "start": None, "end": None, "within": None, "year": None,
+    }
+
+
+# === EventCatalog.query ===
+def test_query_everything_in_time_order(catalog):
+    assert years(catalog, catalog.query()) == [1977, 1979, 1980, 1985, 1986, 1990, 2012]
+
+
+def test_query_time_range_is_half_open(catalog):
+    assert years(catalog, catalog.query(start=1980, end=1990)) == [1980, 1985, 1986]
+
+
+def test_query_word_prefix(catalog):
+    assert years(catalog, catalog.query("jup")) == [1979]
+    assert years(catalog, catalog.query("FLY")) == [1979, 1980]
+
+
+def test_query_words_must_all_match(catalog):
+    assert years(catalog, catalog.query("saturn fly")) == [1980]
+    assert len(catalog.query("saturn portrait")) == 0
+
+
+def test_query_falls_back_to_substrings(catalog):
+    assert years(catalog, catalog.query("yby")) == [1979, 1980]
+
+
+def test_query_name_and_range(catalog):
+    assert years(catalog, catalog.query("cruise", start=1986)) == [1986]
+
+
+def test_query_within_distance(catalog):
+    assert years(catalog, catalog.query(within=1e9)) == [1977, 1979]
+    assert years(catalog, catalog.query("flyby", within=1e9, center=(1.43e9, 5e7, 0.0))) == [1979, 1980]
+
+
+def test_query_from_parsed_text(catalog):
+    query = parse_query("1979-1985 within 2e9 flyby")
+    query.pop("year")
+    assert years(catalog, catalog.query(**query)) == [1979, 1980]
+
+
+def test_query_results_are_read_only_and_cached(catalog):
+    result = catalog.query("cruise")
+    assert not result.flags.writeable
+    assert catalog.query("  Cruise ") is result
+
+
+def test_nearest_year(catalog):
+    assert catalog.events[catalog.nearest_year(1989.4)]["year"] == 1990
+    assert catalog.events[catalog.nearest_year(1900)]["year"] == 1977
+
+
+def test_catalog_over_event_table():
+    from voyager_ephemeris import EventTable
+
+    columns = np.array([[2.0, 1.0, 3.0], [0.0, 1.0, 2.0], [0.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+    table = EventTable(columns, np.array([1, 0, 2], dtype=np.int32), ["", "Alpha One", "Beta"])
+    catalog = EventCatalog(table)
+    assert catalog.query().tolist() == [1, 0, 2]
+    assert catalog.query("alpha").tolist() == [0]
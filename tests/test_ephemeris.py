@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from voyager_ephemeris import load_ephemeris
+
+
+def write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_headerless_file(tmp_path):
+    table = load_ephemeris(write(tmp_path / "a.csv", "1977.5,1,2,3,Launch\n1979,4,5,6\n"), cache_dir=str(tmp_path / "c"))
+    assert table[0] == {"year": 1977.5, "event": "Launch", "coords": (1.0, 2.0, 3.0)}
+    assert table[1] == {"year": 1979, "event": "", "coords": (4.0, 5.0, 6.0)}
+
+
+@pytest.mark.parametrize("header", ["x,y,z,year,event", "Event, Z, Y, X, Year", "time,x,y,z,event"])
+def test_header_may_reorder_columns(tmp_path, header):
+    columns = {"time": 1980.0, "year": 1980.0, "x": 1.0, "y": 2.0, "z": 3.0, "event": "Saturn"}
+    row = ",".join(str(columns[c.strip().lower()]) for c in header.split(","))
+    table = load_ephemeris(write(tmp_path / "b.csv", f"{header}\n{row}\n"), cache_dir=str(tmp_path / "c"))
+    assert table[0] == {"year": 1980, "event": "Saturn", "coords": (1.0, 2.0, 3.0)}
+
+
+def test_missing_column(tmp_path):
+    with pytest.raises(ValueError, match="missing columns: z"):
+        load_ephemeris(write(tmp_path / "c.csv", "year,x,y\n1977,1,2\n"), cache_dir=str(tmp_path / "c"))
+
+
+def test_cache_is_created_and_reused(tmp_path):
+    source = write(tmp_path / "d.csv", "time,x,y,z\n1977,1,2,3\n1978,4,5,6\n")
+    cache_dir = tmp_path / "nested" / "cache"
+    first = load_ephemeris(source, cache_dir=str(cache_dir))
+    files = sorted(p.name for p in cache_dir.iterdir())
+    second = load_ephemeris(source, cache_dir=str(cache_dir))
+    assert sorted(p.name for p in cache_dir.iterdir()) == files
+    assert not any(name.endswith(".tmp") for name in files)
+    np.testing.assert_array_equal(first.columns, second.columns)
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from Voyager_data import SPACECRAFT
+from voyager_fleet import Fleet
+
+SHORT = [  # Unsorted, with a repeated timestamp, inside the others' range
+    {"year": 1995.5, "event": "B", "coords": (3e9, -1e9, 2e8)},
+    {"year": 1990.0, "event": "A", "coords": (1e9, 2e9, 0.0)},
+    {"year": 1995.5, "event": "B again", "coords": (9e9, 9e9, 9e9)},
+    {"year": 2001.25, "event": "C", "coords": (5e9, 0.0, -4e8)},
+]
+SINGLE = [{"year": 2000.0, "event": "Parked", "coords": (1.0, 2.0, 3.0)}]
+
+
+@pytest.mark.parametrize("method", ["linear", "hermite"])
+def test_positions_match_each_trajectory(method):
+    fleet = Fleet({**SPACECRAFT, "Short": SHORT, "Single": SINGLE}, method=method)
+    knots = np.concatenate([t.times for t in fleet.trajectories])
+    times = np.concatenate([
+        np.linspace(fleet.start - 5, fleet.end + 5, 997),  # Covers times outside every craft's range
+        knots, knots - 1e-9, knots + 1e-9,
+    ])
+    expected = np.stack([t.position_at(times) for t in fleet.trajectories], axis=1)
+    np.testing.assert_allclose(fleet.positions_at(times), expected, rtol=1e-12, atol=1e-3)
+
+
+def test_scalar_and_batch_shapes():
+    fleet = Fleet(SPACECRAFT)
+    assert fleet.positions_at(1985.0).shape == (len(SPACECRAFT), 3)
+    assert fleet.positions_at(np.zeros((4, 2)) + 1985.0).shape == (4, 2, len(SPACECRAFT), 3)
+    np.testing.assert_array_equal(fleet.positions_at(1985.0), fleet.positions_at([1985.0])[0])
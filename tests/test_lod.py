@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from voyager_lod import PathLOD
+
+
+def reference_significance(points, min_tol):
+    """Recursive Douglas–Peucker: each split vertex's deviation, capped by its parent's."""
+    sig = np.zeros(len(points))
+    sig[0] = sig[-1] = np.inf
+
+    def split(a, b, parent):
+        if b - a < 2:
+            return
+        ab = points[b] - points[a]
+        l2 = ab @ ab
+        v = points[a + 1:b] - points[a]
+        t = np.clip(v @ ab / l2, 0.0, 1.0) if l2 > 0 else np.zeros(len(v))
+        d = np.linalg.norm(v - t[:, None] * ab, axis=1)
+        i = int(np.argmax(d))
+        if d[i] < min_tol:
+            return
+        sig[a + 1 + i] = min(d[i], parent)
+        split(a, a + 1 + i, sig[a + 1 + i])
+        split(a + 1 + i, b, sig[a + 1 + i])
+
+    split(0, len(points) - 1, np.inf)
+    return sig
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_significance_matches_recursive_douglas_peucker(seed):
+    rng = np.random.default_rng(seed)
+    points = np.cumsum(rng.normal(size=(500, 3)), axis=0)
+    points[100:110] = points[100]  # Repeated vertices give zero-length chords
+    lod = PathLOD(points)
+    np.testing.assert_allclose(lod.significance, reference_significance(points, lod.tolerances[-1]), rtol=1e-9)
+
+
+def test_levels_nest_and_select_by_tolerance():
+    t = np.linspace(0, 6 * np.pi, 2000)
+    lod = PathLOD(np.column_stack([np.cos(t), np.sin(t), 0.1 * t]))
+    for coarse, fine in zip(lod.levels, lod.levels[1:]):
+        assert np.isin(coarse, fine).all()
+    assert np.array_equal(lod.select(lod.tolerances[3]), lod.levels[3])
+    assert len(lod.select(0.0)) == len(lod)
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3])
+def test_tiny_paths(n):
+    lod = PathLOD(np.arange(3.0 * n).reshape(-1, 3))
+    assert len(lod.significance) == n
+    assert np.isinf(lod.significance[[0, -1]]).all() if n else True
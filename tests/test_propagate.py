@@ -0,0 +1,76 @@
+import math
+
+import numpy as np
+import pytest
+
+import voyager_propagate
+from voyager_propagate import AU, YEAR, integrate, lambert, propagate_events, shoot_leg
+
+
+def polar(radius, degrees):
+    angle = math.radians(degrees)
+    return np.array([radius * math.cos(angle), radius * math.sin(angle), 0.02 * radius])
+
+
+def test_lambert_arc_lands_on_target_under_two_body_gravity(monkeypatch):
+    monkeypatch.setattr(voyager_propagate, "GM_PLANETS", np.zeros(8))
+    r1, r2, days = polar(AU, 10.0), polar(1.5 * AU, 120.0), 250.0
+    v = lambert(r1, r2, days * 86400.0)
+    final = integrate(2000.0, 2000.0 + days * 86400.0 / YEAR, np.concatenate([r1, v]), rtol=1e-11)
+    assert np.linalg.norm(final[0, :3] - r2) < 1.0  # km
+
+
+def test_integrate_keeps_a_circular_orbit(monkeypatch):
+    monkeypatch.setattr(voyager_propagate, "GM_PLANETS", np.zeros(8))
+    speed = math.sqrt(voyager_propagate.GM_SUN / AU)
+    state = np.array([AU, 0.0, 0.0, 0.0, speed, 0.0])
+    period = 2 * math.pi * AU / speed / YEAR
+    final, times, path = integrate(2000.0, 2000.0 + period, state, record=True)
+    assert np.linalg.norm(final[0, :3] - state[:3]) < 10.0
+    assert times[0] == 2000.0 and times[-1] == pytest.approx(2000.0 + period)
+    np.testing.assert_allclose(np.linalg.norm(path[:, :3], axis=1), AU, rtol=1e-8)
+
+
+def test_lambert_rejects_degenerate_geometry():
+    with pytest.raises(ValueError):
+        lambert(polar(AU, 0.0), polar(2 * AU, 0.0), 1e7)
+    with pytest.raises(ValueError):
+        lambert(np.zeros(3), polar(AU, 90.0), 1e7)
+
+
+def test_shoot_leg_lands_within_tolerance():
+    r0, r1 = polar(5.2 * AU, 30.0), polar(9.0 * AU, 80.0)
+    times, states, miss = shoot_leg(1979.5, 1981.5, r0, r1, tolerance=10.0)
+    assert miss <= 10.0
+    assert np.linalg.norm(states[-1, :3] - r1) == pytest.approx(miss)
+    np.testing.assert_array_equal(states[0, :3], r0)
+    assert times[0] == 1979.5 and times[-1] == pytest.approx(1981.5)
+
+
+WAYPOINTS = [
+    {"year": 1980.0, "event": "A", "coords": tuple(polar(5.2 * AU, 30.0))},
+    {"year": 1981.0, "event": "", "coords": tuple(polar(7.0 * AU, 60.0))},
+    {"year": 1982.0, "event": "C", "coords": tuple(polar(9.0 * AU, 80.0))},
+]
+
+
+def test_propagate_events_reads_the_cache_on_the_second_call(tmp_path, monkeypatch):
+    first = propagate_events(WAYPOINTS, cache_dir=str(tmp_path), step_hours=24.0)
+    times = first.columns[0]
+    assert np.diff(times).max() == pytest.approx(1 / 365.25)  # Daily samples
+    assert np.isin([1980.0, 1981.0, 1982.0], times).all()  # Plus every waypoint time
+    assert [first[i]["event"] for i in np.flatnonzero(first.label_ids)] == ["A", "C"]
+    np.testing.assert_array_equal(first.columns[1:, -1], WAYPOINTS[-1]["coords"])
+
+    def no_propagation(*args, **kwargs):
+        raise AssertionError("propagated again instead of reading the cache")
+
+    monkeypatch.setattr(voyager_propagate, "propagate", no_propagation)
+    second = propagate_events(WAYPOINTS, cache_dir=str(tmp_path), step_hours=24.0)
+    assert isinstance(second.columns, np.memmap)
+    np.testing.assert_array_equal(second.columns, first.columns)
+    assert second.labels == first.labels
+    assert not any(name.endswith(".tmp") for name in (p.name for p in tmp_path.iterdir()))
+
+    with pytest.raises(AssertionError):
+        propagate_events(WAYPOINTS, cache_dir=str(tmp_path), step_hours=12.0)  # Other parameters miss the cache
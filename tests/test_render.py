@@ -0,0 +1,18 @@
+import io
+
+import numpy as np
+
+import voyager_render
+from voyager_render import HeadlessPlot, render_frames
+
+
+def test_raw_frames_arrive_in_order_with_byte_capped_chunks(monkeypatch):
+    size = (64, 48)
+    monkeypatch.setattr(voyager_render, "MAX_CHUNK_BYTES", 2 * 64 * 48 * 4)  # Two frames per chunk
+    sink = io.BytesIO()
+    render_frames(7, workers=2, chunk_size=32, sink=sink, size=size, dpi=20, trail=False)
+    frames = np.frombuffer(sink.getvalue(), dtype=np.uint8).reshape(7, 48, 64, 4)
+
+    plot = HeadlessPlot(size=size, dpi=20, num_steps=7, trail=False)
+    for i in (0, 3, 6):
+        np.testing.assert_array_equal(frames[i], plot.render_frame(i))
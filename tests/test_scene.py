@@ -0,0 +1,26 @@
+import numpy as np
+
+from voyager_render import HeadlessPlot
+
+
+def test_trail_collection_follows_the_marker_in_2d():
+    plot = HeadlessPlot(size=(160, 120), dpi=20, mode="2D", num_steps=50)
+    for step in range(5):
+        plot.render_frame(step)
+    newest = np.asarray(plot.trail_line.get_segments()[-1])
+    np.testing.assert_allclose(newest, plot.fleet_path[3:5, 0, :2])
+
+    plot.render_frame(40)  # A jump rebuilds the trail from the path
+    segments = np.asarray(plot.trail_line.get_segments())
+    np.testing.assert_allclose(segments[-1], plot.fleet_path[39:41, 0, :2])
+    np.testing.assert_allclose(segments[:, 1], plot.trail.segments_xy[:, 1])
+
+
+def test_trail_is_drawn_in_3d():
+    with_trail = HeadlessPlot(size=(160, 120), dpi=20, num_steps=50)
+    without = HeadlessPlot(size=(160, 120), dpi=20, num_steps=50, trail=False)
+    for step in range(6):
+        a, b = with_trail.render_frame(step), without.render_frame(step)
+    assert not np.array_equal(a, b)
+    with_trail.set_trail(False)
+    np.testing.assert_array_equal(with_trail.render_frame(6), without.render_frame(6))
@@ -0,0 +1,54 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from voyager_server import RenderService
+
+
+@pytest.fixture
+def service():
+    service = RenderService(workers=1, steps=101)
+    yield service
+    service.shutdown()
+
+
+def test_key_snaps_time_to_steps(service):
+    span = service.end - service.start
+    assert service.key(service.start)[3] == 0
+    assert service.key(service.start + span / 2)[3] == 50
+    assert service.key(service.end)[3] == 100
+
+
+def test_key_clips_out_of_range_times(service):
+    assert service.key(1e308)[3] == 100
+    assert service.key(-1e308)[3] == 0
+    assert service.key(service.start - 1000)[3] == 0
+
+
+@pytest.mark.parametrize("bad", [{"time": float("inf")}, {"time": float("nan")}, {"elev": float("inf")},
+                                 {"azim": float("nan")}, {"mode": "4D"}, {"size": (8, 600)}])
+def test_key_rejects_invalid_requests(service, bad):
+    with pytest.raises(ValueError):
+        service.key(**bad)
+
+
+def test_key_shares_2d_entries_across_angles(service):
+    assert service.key(mode="2D", elev=10, azim=20) == service.key(mode="2D", elev=40, azim=-60)
+    assert service.key(elev=10) != service.key(elev=40)
+
+
+def test_frame_with_an_already_finished_render(service, monkeypatch):
+    def submit(fn, *args):
+        future = Future()
+        future.set_result(b"png")
+        return future
+
+    monkeypatch.setattr(service._pool, "submit", submit)
+    result = []
+    thread = threading.Thread(target=lambda: result.append(service.frame(service.key())), daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+    assert result == [b"png"]
+    assert service.cache.get(service.key())[0] == b"png"
+    assert service.stats()["inflight"] == 0
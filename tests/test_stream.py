@@ -0,0 +1,34 @@
+import numpy as np
+
+from voyager_stream import TelemetryBuffer, parse_lines
+
+
+def test_parse_lines_skips_headers_comments_and_malformed():
+    rows = parse_lines([
+        "time,x,y,z,event",
+        "# comment",
+        "1977.1,1e6,2e6,0,Launch",
+        "1977.2,oops,2e6,0",
+        "1977.3,1e6",
+        "1977.4,3e6,4e6,5e6",
+    ])
+    assert rows.tolist() == [[1977.1, 1e6, 2e6, 0.0], [1977.4, 3e6, 4e6, 5e6]]
+
+
+def test_parse_lines_drops_non_finite_rows():
+    rows = parse_lines(["1977.1,1e6,2e6,0", "1977.3,inf,3e6,0", "nan,1,2,3", "1977.4,1,-Infinity,3", "1977.5,1,2,3"])
+    assert rows[:, 0].tolist() == [1977.1, 1977.5]
+    assert np.isfinite(rows).all()
+
+
+def test_parse_lines_empty():
+    assert parse_lines([]).shape == (0, 4)
+    assert parse_lines(["1977.3,inf,3e6,0"]).shape == (0, 4)
+
+
+def test_buffer_keeps_latest_samples_in_order():
+    buffer = TelemetryBuffer(capacity=3)
+    buffer.extend([[t, 0, 0, 0] for t in range(5)])
+    buffer.extend([[5, 0, 0, 0]])
+    assert buffer.snapshot()[:, 0].tolist() == [3, 4, 5]
+    assert len(buffer) == 3 and buffer.version == 2
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from Voyager_data import VOYAGER_EVENTS
+from voyager_trajectory import Trajectory
+
+
+def brute_force_time_at(trajectory, queries):
+    a, ab = trajectory.positions[:-1], np.diff(trajectory.positions, axis=0)
+    ab2 = np.maximum(np.einsum("ij,ij->i", ab, ab), 1e-300)
+    s = np.clip(np.einsum("mij,ij->mi", queries[:, None] - a, ab) / ab2, 0.0, 1.0)
+    d2 = np.sum((queries[:, None] - (a + s[..., None] * ab)) ** 2, axis=2)
+    best = np.argmin(d2, axis=1)
+    rows = np.arange(len(queries))
+    return trajectory.times[best] + s[rows, best] * np.diff(trajectory.times)[best], d2[rows, best]
+
+
+def random_walk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    points = np.cumsum(rng.normal(size=(n, 3)), axis=0)
+    return [{"year": 1977.0 + i, "event": "", "coords": tuple(p)} for i, p in enumerate(points)]
+
+
+@pytest.mark.parametrize("method", Trajectory.METHODS)
+def test_time_at_inverts_position_at(method):
+    trajectory = Trajectory(VOYAGER_EVENTS, method="linear")
+    times = np.linspace(trajectory.start, trajectory.end, 200)
+    found = Trajectory(VOYAGER_EVENTS, method=method).time_at(trajectory.position_at(times))
+    np.testing.assert_allclose(trajectory.position_at(found), trajectory.position_at(times), rtol=0, atol=1.0)
+
+
+@pytest.mark.parametrize("n", [2, 3, 17, 1000])
+def test_time_at_matches_brute_force(n):
+    trajectory = Trajectory(random_walk(n))
+    queries = np.random.default_rng(1).normal(scale=np.sqrt(n), size=(300, 3)) + trajectory.positions.mean(axis=0)
+    found = trajectory.time_at(queries)
+    expected, expected_d2 = brute_force_time_at(trajectory, queries)
+    d2 = np.sum((trajectory.position_at(found) - queries) ** 2, axis=1)
+    # Ties between equally close segments may pick either one, so compare distances
+    np.testing.assert_allclose(d2, expected_d2, rtol=1e-9, atol=1e-9)
+    assert np.mean(np.isclose(found, expected)) > 0.99
+
+
+def test_time_at_scalar_and_single_event():
+    trajectory = Trajectory(VOYAGER_EVENTS)
+    t = trajectory.times[5]
+    assert trajectory.time_at(trajectory.positions[5]) == pytest.approx(t)
+    assert np.ndim(trajectory.time_at(trajectory.positions[5])) == 0
+    assert Trajectory(VOYAGER_EVENTS[:1]).time_at([(1.0, 2.0, 3.0)]).tolist() == [VOYAGER_EVENTS[0]["year"]]
+
+
+def test_time_at_clamps_to_the_ends():
+    trajectory = Trajectory(VOYAGER_EVENTS)
+    beyond = trajectory.positions[-1] + 10 * (trajectory.positions[-1] - trajectory.positions[-2])
+    assert trajectory.time_at(beyond) == pytest.approx(trajectory.end)
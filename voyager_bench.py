@@ -0,0 +1,253 @@
+# voyager_bench.py
+"""Headless benchmarks for the plotting, interpolation and lookup hot paths.
+
+Each trajectory size runs in a fresh process on the Agg backend (and,
+with ``--qt``, in an offscreen Qt window), so startup and peak memory are
+measured from a clean interpreter:
+
+    python voyager_bench.py --out bench.json
+    python voyager_bench.py --sizes 1e2 1e4 1e6 1e7 --out bench.json
+    python voyager_bench.py --baseline bench_baseline.json --threshold 0.2
+
+With ``--baseline`` every metric is compared against the stored run and
+the script exits with status 1 if any got worse by more than the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Metric name -> which direction is better
+METRICS = {
+    "prepare_s": "lower",
+    "startup_s": "lower",
+    "mode_build_s": "lower",
+    "mode_switch_ms": "lower",
+    "frame_3d_ms": "lower",
+    "frame_2d_ms": "lower",
+    "frame_p95_ms": "lower",
+    "year_search_us": "lower",
+    "nearest_per_s": "higher",
+    "peak_mb": "lower",
+    "window_startup_s": "lower",
+    "window_frame_ms": "lower",
+}
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+def synthetic_events(n, seed=0):
+    """An ``EventTable`` of ``n`` waypoints on an outward spiral shaped like Voyager 1's path."""
+    from voyager_ephemeris import EventTable
+
+    rng = np.random.default_rng(seed)
+    times = np.linspace(1977.0, 2025.0, n)
+    u = np.linspace(0.0, 1.0, n)
+    radius = 2.2e10 * u ** 1.2
+    angle = 2.5 * np.pi * u + rng.normal(0.0, 1e-3, n)
+    columns = np.empty((4, n))
+    columns[0] = times
+    columns[1] = radius * np.cos(angle)
+    columns[2] = radius * np.sin(angle)
+    columns[3] = 0.15 * radius * u + rng.normal(0.0, 1e6, n)
+    labels = ["Cruise", "Flyby", "Heliopause", "Interstellar Cruise"]
+    label_ids = rng.integers(0, len(labels), n).astype(np.int32)
+    return EventTable(columns, label_ids, labels)
+
+
+def _timed(fn, repeat):
+    """Call ``fn`` ``repeat`` times and return the individual wall times in seconds."""
+    samples = np.empty(repeat)
+    for k in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples[k] = time.perf_counter() - start
+    return samples
+
+
+def _peak_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, kilobytes elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+# === Benchmarks (run inside a worker process) ===
+def bench_scene(events, frames, seed):
+    from voyager_render import HeadlessPlot
+    from voyager_scene import prepare_data
+
+    result = {}
+    start = time.perf_counter()
+    prepare_data(events)
+    result["prepare_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    plot = HeadlessPlot(size=(1280, 720), events=events)
+    plot.render_frame(0)
+    result["startup_s"] = time.perf_counter() - start
+
+    steps = np.arange(1, frames + 1) % plot.num_steps
+    frame_3d = np.array([_timed(lambda: plot.render_frame(i), 1)[0] for i in steps])
+
+    start = time.perf_counter()
+    plot.set_mode("2D")
+    result["mode_build_s"] = time.perf_counter() - start
+    frame_2d = np.array([_timed(lambda: plot.render_frame(i), 1)[0] for i in steps])
+
+    modes = iter(["3D", "2D"] * 10)
+    switches = _timed(lambda: plot.set_mode(next(modes)), 20)
+
+    result["mode_switch_ms"] = np.median(switches) * 1000
+    result["frame_3d_ms"] = np.median(frame_3d) * 1000
+    result["frame_2d_ms"] = np.median(frame_2d) * 1000
+    result["frame_p95_ms"] = np.percentile(np.concatenate([frame_3d, frame_2d]), 95) * 1000
+
+    # Year search: the lookups behind MainWindow.search_year, without the dialog
+    trajectory = plot.trajectory
+    years = np.random.default_rng(seed).uniform(trajectory.start, trajectory.end, 1000)
+
+    def search():
+        for year in years:
+            trajectory.position_at(year)
+            trajectory.segment_index(year)
+
+    result["year_search_us"] = np.median(_timed(search, 5)) / len(years) * 1e6
+    return result
+
+
+def bench_nearest(events, seed, queries=20_000):
+    from voyager_index import SpatialEventIndex
+
+    index = SpatialEventIndex(events, radius=1e9)
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(index), queries)
+    points = index.coords[picks] + rng.normal(0.0, 5e8, (queries, 3))
+
+    start = time.perf_counter()
+    for point in points:
+        index.nearest(point)
+    return {"nearest_per_s": queries / (time.perf_counter() - start)}
+
+
+def bench_window(events, frames):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    start = time.perf_counter()
+    from voyager_ui import MainWindow
+
+    window = MainWindow(events=events)
+    window.show()
+    while window.plot_widget is None:  # The plot is built after the shell paints
+        app.processEvents()
+    window.timer.stop()
+    app.processEvents()
+    startup = time.perf_counter() - start
+
+    window.frame_interval = 1  # Keep late-tick frame dropping out of the measurement
+    samples = _timed(lambda: (window.animate_voyager(), app.processEvents()), frames)
+    window.close()
+    return {"window_startup_s": startup, "window_frame_ms": np.median(samples) * 1000}
+
+
+def run_size(n, frames, seed, qt):
+    """Run every benchmark for one trajectory size and return ``{metric: value}``."""
+    events = synthetic_events(n, seed)
+    result = {}
+    result.update(bench_scene(events, frames, seed))
+    result.update(bench_nearest(events, seed))
+    if qt:
+        result.update(bench_window(events, frames))
+    result["peak_mb"] = _peak_mb()
+    return {k: (None if v is None else float(v)) for k, v in result.items()}
+
+
+# === Reporting ===
+def compare(results, baseline, threshold):
+    """Return ``(size, metric, old, new, change)`` for metrics that regressed by more than ``threshold``."""
+    regressions = []
+    for size, metrics in results.items():
+        old_metrics = baseline.get(size, {})
+        for name, new in metrics.items():
+            old = old_metrics.get(name)
+            if old is None or new is None or old <= 0:
+                continue
+            change = (new - old) / old if METRICS.get(name) == "lower" else (old - new) / old
+            if change > threshold:
+                regressions.append((size, name, old, new, change))
+    return regressions
+
+
+def _environment():
+    import matplotlib
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def _print_table(results):
+    names = [m for m in METRICS if any(r.get(m) is not None for r in results.values())]
+    print(f"{'points':>10} " + " ".join(f"{m:>15}" for m in names), file=sys.stderr)
+    for size, metrics in results.items():
+        cells = [metrics.get(m) for m in names]
+        print(f"{size:>10} " + " ".join(f"{'-' if v is None else f'{v:.4g}':>15}" for v in cells), file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Voyager viewer's hot paths without a display")
+    parser.add_argument("--sizes", type=float, nargs="+", default=DEFAULT_SIZES,
+                        help="Trajectory sizes in points (default: 1e2 to 1e6)")
+    parser.add_argument("--frames", type=int, default=60, help="Animation frames timed per mode")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--qt", action="store_true", help="Also time the offscreen Qt window")
+    parser.add_argument("--out", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for n in (int(s) for s in args.sizes):
+        # A fresh interpreter per size keeps startup and peak memory independent
+        with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+            results[str(n)] = pool.submit(run_size, n, args.frames, args.seed, args.qt).result()
+        print(f"{n:>10} points done", file=sys.stderr)
+
+    _print_table(results)
+    report = {"environment": _environment(), "frames": args.frames, "seed": args.seed, "results": results}
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for size, name, old, new, change in regressions:
+            print(f"REGRESSION {name} @ {size} points: {old:.4g} -> {new:.4g} ({change:+.0%})", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import functools
+import re
+from bisect import bisect_left
+import numpy as np
+from voyager_ephemeris import EventTable, event_arrays
+
+_WORD = re.compile(r"\w+")
+_NUMBER = r"\d+(?:\.\d+)?(?:[eE][+-]?\d+)?"
+_RANGE = re.compile(rf"\b({_NUMBER})\s*(?:-|–|to|\.\.)\s*({_NUMBER})\b")
+_YEAR = re.compile(r"\b(\d{4}(?:\.\d+)?)\b")
+_WITHIN = re.compile(rf"\bwithin\s+({_NUMBER})\s*(?:km)?", re.IGNORECASE)
+
+
+class EventCatalog:
+    """Query index over an event list or ``EventTable``.
+
+    Events are ordered by time once, so a time range is a ``slice`` of
+    ``order`` found by bisection. Event names are split into lowercase
+    words kept in a sorted list, so a word prefix finds its names by
+    bisection as well, and each name's events are a contiguous slice of a
+    (name, time)-sorted array. Results are arrays of event indices in time
+    order; recent queries are kept in an LRU cache and returned read-only.
+    """
+
+    def __init__(self, events, cache_size=256):
+        self.events = events
+        times, self.coords = event_arrays(events)
+        self.order = np.argsort(times, kind="stable")
+        self.sorted_times = times[self.order]
+        self._rank = np.empty_like(self.order)
+        self._rank[self.order] = np.arange(len(self.order))
+
+        if isinstance(events, EventTable):
+            self.labels, label_ids = list(events.labels), np.asarray(events.label_ids)
+        else:
+            labels, label_ids = np.unique([e["event"] for e in events], return_inverse=True)
+            self.labels = labels.tolist()
+
+        # Events grouped by name; each group is a time-ordered slice of _by_label
+        self._by_label = self.order[np.argsort(label_ids[self.order], kind="stable")]
+        self._label_starts = np.searchsorted(label_ids[self._by_label], np.arange(len(self.labels) + 1))
+
+        # Inverted index: sorted (word, label id) pairs
+        pairs = sorted({(w, k) for k, label in enumerate(self.labels) for w in _WORD.findall(label.lower())})
+        self._words = [w for w, _ in pairs]
+        self._word_labels = [k for _, k in pairs]
+
+        self._cached_query = functools.lru_cache(maxsize=cache_size)(self._query)
+
+    def __len__(self):
+        return len(self.order)
+
+    def time_slice(self, start=None, end=None):
+        """Slice of ``order`` covering times in ``[start, end)``."""
+        lo = 0 if start is None else int(np.searchsorted(self.sorted_times, start, side="left"))
+        hi = len(self.order) if end is None else int(np.searchsorted(self.sorted_times, end, side="left"))
+        return slice(lo, max(lo, hi))
+
+    def nearest_year(self, time):
+        """Index of the event closest in time to ``time``, or None if there are no events."""
+        if not len(self.order):
+            return None
+        i = int(np.searchsorted(self.sorted_times, time))
+        if i == len(self.order) or (i > 0 and time - self.sorted_times[i - 1] <= self.sorted_times[i] - time):
+            i -= 1
+        return int(self.order[i])
+
+    def label_events(self, label_id):
+        """Indices of every event named ``labels[label_id]``, in time order."""
+        return self._by_label[self._label_starts[label_id]:self._label_starts[label_id + 1]]
+
+    def match_labels(self, text):
+        """Ids of names containing every word of ``text``: as a word prefix, else as a substring."""
+        matched = None
+        for word in _WORD.findall(text.lower()):
+            ids = set()
+            i = bisect_left(self._words, word)
+            while i < len(self._words) and self._words[i].startswith(word):
+                ids.add(self._word_labels[i])
+                i += 1
+            if not ids:
+                ids = {k for k, label in enumerate(self.labels) if word in label.lower()}
+            matched = ids if matched is None else matched & ids
+        return sorted(matched or ())
+
+    def query(self, text=None, start=None, end=None, within=None, center=(0.0, 0.0, 0.0)):
+        """Events matching a name search, a time range ``[start, end)`` and a distance from ``center`` (km).
+
+        Every criterion is optional; the result is a read-only array of
+        event indices in time order.
+        """
+        text = " ".join(_WORD.findall(text.lower())) if text else None
+        return self._cached_query(text or None, start, end, within, tuple(center))
+
+    def _query(self, text, start, end, within, center):
+        window = self.time_slice(start, end)
+        if text is None:
+            result = self.order[window]
+        else:
+            groups = [self.label_events(k) for k in self.match_labels(text)]
+            ranks = np.sort(self._rank[np.concatenate(groups)]) if groups else np.zeros(0, dtype=np.int64)
+            ranks = ranks[(ranks >= window.start) & (ranks < window.stop)]
+            result = self.order[ranks]
+
+        if within is not None:
+            distance = np.linalg.norm(self.coords[result] - center, axis=1)
+            result = result[distance <= within]
+        result.setflags(write=False)
+        return result
+
+
+def parse_query(text):
+    """Split a search box entry into ``EventCatalog.query`` keywords.
+
+    ``"1979-1990 within 5e9 flyby"`` gives a time range covering both
+    whole years, a 5e9 km distance limit and the name words. A single
+    year is returned as ``year`` for position lookups; a whole year also
+    becomes a one-year range.
+    """
+    query = {"text": None, "start": None, "end": None, "within": None, "year": None}
+    rest = text
+
+    m = _WITHIN.search(rest)
+    if m:
+        query["within"] = float(m.group(1))
+        rest = rest[:m.start()] + rest[m.end():]
+
+    m = _RANGE.search(rest)
+    if m:
+        start, end = sorted((float(m.group(1)), float(m.group(2))))
+        query["start"], query["end"] = start, end + 1 if end.is_integer() else end
+        rest = rest[:m.start()] + rest[m.end():]
+    else:
+        m = _YEAR.search(rest)
+        if m:
+            year = float(m.group(1))
+            if year.is_integer():
+                query["year"] = int(year)
+                query["start"], query["end"] = year, year + 1
+            else:
+                query["year"] = year
+            rest = rest[:m.start()] + rest[m.end():]
+
+    query["text"] = " ".join(_WORD.findall(rest)) or None
+    return query
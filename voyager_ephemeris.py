@@ -0,0 +1,198 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+# Bump when the on-disk layout changes so stale caches are rebuilt
+CACHE_VERSION = 1
+COLUMNS = ("time", "x", "y", "z")
+
+
+class EventTable:
+    """Columnar event storage that also behaves like the ``VOYAGER_EVENTS`` list.
+
+    ``columns`` is a ``(4, n)`` float array (time, x, y, z), usually a
+    read-only memory map of the binary cache. Indexing or iterating yields
+    ``{"year", "event", "coords"}`` dicts built on demand, so code written
+    against the plain list keeps working while hot paths read ``times`` and
+    ``coords`` directly.
+    """
+
+    def __init__(self, columns, label_ids, labels):
+        self.columns = columns
+        self.label_ids = label_ids
+        self.labels = labels
+
+    @property
+    def times(self):
+        return self.columns[0]
+
+    @property
+    def coords(self):
+        return self.columns[1:].T
+
+    def __len__(self):
+        return self.columns.shape[1]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        t, x, y, z = self.columns[:, i].tolist()
+        year = int(t) if t.is_integer() else t
+        return {"year": year, "event": self.labels[self.label_ids[i]], "coords": (x, y, z)}
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def event_arrays(events):
+    """Return ``(times, coords)`` arrays for an ``EventTable`` or a list of event dicts."""
+    if isinstance(events, EventTable):
+        return events.times, events.coords
+    times = np.array([e["year"] for e in events], dtype=np.float64)
+    coords = np.array([e["coords"] for e in events], dtype=np.float64).reshape(-1, 3)
+    return times, coords
+
+
+def cache_paths(source, cache_dir=None):
+    source = os.path.abspath(source)
+    folder = cache_dir or os.path.dirname(source)
+    # The path hash keeps same-named sources from sharing one cache in a common cache_dir
+    digest = hashlib.sha1(source.encode()).hexdigest()[:12]
+    stem = os.path.join(folder, f"{os.path.basename(source)}.{digest}")
+    return stem + ".cols.npy", stem + ".labels.npy", stem + ".meta.json"
+
+
+def load_ephemeris(source, cache_dir=None, chunk_rows=500_000):
+    """Load a CSV ephemeris, converting it to a binary cache on first use.
+
+    The source is comma separated with columns ``time, x, y, z`` and an
+    optional ``event`` label; time is a decimal year. A header line naming
+    the columns is optional and may reorder them. Lines starting with ``#``
+    are ignored.
+
+    The first load streams the text in chunks of ``chunk_rows`` lines into
+    ``.npy`` files next to the source (or in ``cache_dir``). Later loads
+    memory-map those files without parsing anything, as long as the source
+    size and modification time are unchanged.
+    """
+    cols_path, labels_path, meta_path = cache_paths(source, cache_dir)
+    stat = os.stat(source)
+
+    meta = None
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+    fresh = (
+        meta is not None
+        and meta.get("version") == CACHE_VERSION
+        and meta.get("source_size") == stat.st_size
+        and meta.get("source_mtime") == stat.st_mtime_ns
+        and os.path.exists(cols_path)
+        and os.path.exists(labels_path)
+    )
+    if not fresh:
+        meta = _build_cache(source, cols_path, labels_path, meta_path, stat, chunk_rows)
+
+    return EventTable(
+        np.load(cols_path, mmap_mode="r"),
+        np.load(labels_path, mmap_mode="r"),
+        meta["labels"],
+    )
+
+
+def _data_lines(f):
+    for line in f:
+        if line.strip() and not line.lstrip().startswith("#"):
+            yield line
+
+
+def _parse_header(line):
+    """Column positions from a header line, or None if the line is data."""
+    fields = [c.strip().lower() for c in line.split(",")]
+    try:
+        float(fields[0])
+        return None
+    except ValueError:
+        pass
+    fields = ["time" if c == "year" else c for c in fields]
+    missing = [c for c in COLUMNS if c not in fields]
+    if missing:
+        raise ValueError(f"Ephemeris header is missing columns: {', '.join(missing)}")
+    return [fields.index(c) for c in COLUMNS], fields.index("event") if "event" in fields else None
+
+
+def _build_cache(source, cols_path, labels_path, meta_path, stat, chunk_rows):
+    # Pass 1: count rows and read the header so the output can be preallocated
+    with open(source, encoding="utf-8") as f:
+        lines = _data_lines(f)
+        first = next(lines, None)
+        rows = sum(1 for _ in lines)
+    if first is None:
+        raise ValueError(f"Ephemeris file {source!r} has no data rows.")
+
+    header = _parse_header(first)
+    if header is None:
+        rows += 1
+        ncols = len(first.split(","))
+        usecols, label_col = list(range(4)), (4 if ncols > 4 else None)
+    else:
+        usecols, label_col = header
+
+    os.makedirs(os.path.dirname(cols_path), exist_ok=True)
+    tmp_cols, tmp_labels = cols_path + ".tmp", labels_path + ".tmp"
+    try:
+        labels = _fill_cache(source, tmp_cols, tmp_labels, rows, header, usecols, label_col, chunk_rows)
+    except BaseException:
+        for path in (tmp_cols, tmp_labels):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    os.replace(tmp_cols, cols_path)
+    os.replace(tmp_labels, labels_path)
+
+    meta = {
+        "version": CACHE_VERSION,
+        "source_size": stat.st_size,
+        "source_mtime": stat.st_mtime_ns,
+        "rows": rows,
+        "labels": list(labels),
+    }
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+    return meta
+
+
+def _fill_cache(source, tmp_cols, tmp_labels, rows, header, usecols, label_col, chunk_rows):
+    """Pass 2: stream chunks of text into preallocated column files; returns the name -> label id map."""
+    columns = np.lib.format.open_memmap(tmp_cols, mode="w+", dtype=np.float64, shape=(4, rows))
+    label_ids = np.lib.format.open_memmap(tmp_labels, mode="w+", dtype=np.int32, shape=(rows,))
+    labels = {"": 0}
+
+    with open(source, encoding="utf-8") as f:
+        lines = _data_lines(f)
+        if header is not None:
+            next(lines)
+        start = 0
+        while start < rows:
+            chunk = [line for _, line in zip(range(chunk_rows), lines)]
+            if not chunk:
+                break
+            stop = start + len(chunk)
+            values = np.loadtxt(chunk, delimiter=",", usecols=usecols, ndmin=2, dtype=np.float64)
+            columns[:, start:stop] = values.T
+            if label_col is not None:
+                names = [
+                    fields[label_col].strip() if len(fields) > label_col else ""
+                    for fields in (line.rstrip("\r\n").split(",") for line in chunk)
+                ]
+                label_ids[start:stop] = [labels.setdefault(n, len(labels)) for n in names]
+            else:
+                label_ids[start:stop] = 0
+            start = stop
+
+    columns.flush()
+    label_ids.flush()
+    del columns, label_ids
+    return labels
@@ -0,0 +1,62 @@
+import numpy as np
+from voyager_trajectory import Trajectory
+
+
+class Fleet:
+    """Several spacecraft trajectories stacked for batched position lookups.
+
+    Each craft's knots are concatenated into one array, with craft ``r``'s
+    times shifted by ``r * stride`` so that all rows are searched by a
+    single ``np.searchsorted``. ``positions_at`` then interpolates every
+    craft at every requested time in one vectorised pass. Times outside a
+    craft's own range are clamped to its first or last waypoint.
+    """
+
+    def __init__(self, craft, method="linear"):
+        self.names = list(craft)
+        self.trajectories = [Trajectory(events, method=method) for events in craft.values()]
+        self.method = method
+
+        lengths = [len(t) for t in self.trajectories]
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)])
+        self.starts = np.array([t.start for t in self.trajectories])
+        self.ends = np.array([t.end for t in self.trajectories])
+        self.start, self.end = self.starts.min(), self.ends.max()
+
+        # Row r occupies [r * stride, r * stride + span] on the shared search axis
+        self._stride = (self.end - self.start) + 1.0
+        rows = np.repeat(np.arange(len(self.names)), lengths)
+        self._times = np.concatenate([t.times for t in self.trajectories])
+        self._keys = self._times + rows * self._stride
+        self.positions = np.concatenate([t.positions for t in self.trajectories])
+        if method == "hermite":
+            self._tangents = np.concatenate([t._tangents for t in self.trajectories])
+
+    def __len__(self):
+        return len(self.names)
+
+    def index(self, name):
+        return self.names.index(name)
+
+    def positions_at(self, times):
+        """Positions of every craft, shape ``(len(fleet), 3)`` for a scalar time or ``(m, len(fleet), 3)`` for ``m`` times."""
+        times = np.asarray(times, dtype=np.float64)
+        t = np.clip(times[..., None], self.starts, self.ends)
+        rows = np.arange(len(self.names))
+
+        first, last = self.offsets[:-1], self.offsets[1:] - 1
+        i = np.searchsorted(self._keys, t + rows * self._stride, side="right") - 1
+        i = np.clip(i, first, np.maximum(last - 1, first))
+        j = np.minimum(i + 1, last)
+
+        t0, t1 = self._times[i], self._times[j]
+        dt = t1 - t0
+        u = np.divide(t - t0, dt, out=np.zeros_like(t), where=dt > 0)[..., None]
+        p0, p1 = self.positions[i], self.positions[j]
+
+        if self.method == "linear":
+            return p0 + u * (p1 - p0)
+        u2, u3 = u * u, u * u * u
+        d = dt[..., None]
+        return ((2 * u3 - 3 * u2 + 1) * p0 + (u3 - 2 * u2 + u) * d * self._tangents[i]
+                + (-2 * u3 + 3 * u2) * p1 + (u3 - u2) * d * self._tangents[j])
@@ -0,0 +1,51 @@
+import numpy as np
+from voyager_ephemeris import event_arrays
+
+
+class SpatialEventIndex:
+    """Uniform grid over event coordinates for fixed-radius nearest lookups.
+
+    The grid cell size equals the search radius, so any event within the
+    radius of a query point lies in the query's cell or one of its 26
+    neighbours. Each lookup touches at most 27 small buckets regardless of
+    how many events are indexed.
+    """
+
+    def __init__(self, events, radius=1e9):
+        self.radius = float(radius)
+        self.coords = np.ascontiguousarray(event_arrays(events)[1])
+
+        # Group event indices by integer grid cell
+        self._cells = {}
+        if len(self.coords):
+            keys = np.floor(self.coords / self.radius).astype(np.int64)
+            order = np.lexsort(keys.T[::-1])
+            sorted_keys = keys[order]
+            splits = np.flatnonzero(np.any(np.diff(sorted_keys, axis=0), axis=1)) + 1
+            for group in np.split(order, splits):
+                self._cells[tuple(keys[group[0]])] = group
+
+        offsets = np.arange(-1, 2)
+        self._neighbours = np.stack(
+            np.meshgrid(offsets, offsets, offsets, indexing="ij"), axis=-1
+        ).reshape(-1, 3)
+
+    def __len__(self):
+        return len(self.coords)
+
+    def nearest(self, point):
+        """Return the index of the closest event within the radius, or None."""
+        point = np.asarray(point, dtype=np.float64)
+        cell = np.floor(point / self.radius).astype(np.int64)
+
+        buckets = [self._cells.get(tuple(c)) for c in (cell + self._neighbours).tolist()]
+        buckets = [b for b in buckets if b is not None]
+        if not buckets:
+            return None
+
+        candidates = np.concatenate(buckets)
+        d2 = np.sum((self.coords[candidates] - point) ** 2, axis=1)
+        best = int(np.argmin(d2))
+        if d2[best] >= self.radius ** 2:
+            return None
+        return int(candidates[best])
@@ -0,0 +1,119 @@
+import numpy as np
+
+
+class PathLOD:
+    """Douglas–Peucker level-of-detail pyramid for a 3D polyline.
+
+    One simplification pass records, for every vertex, the deviation at which
+    Douglas–Peucker keeps it. Level ``k`` holds the vertices whose deviation
+    is at least ``extent / 2**k``. Coarse levels are therefore subsets of finer
+    ones, and choosing a level for a view is a lookup by tolerance.
+    Refinement stops at ``extent / 2**max_level``. Below that, :meth:`select`
+    returns every vertex and the caller is expected to crop to the view.
+    """
+
+    def __init__(self, points, max_level=16):
+        self.points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 3)
+        n = len(self.points)
+        lo, hi = (self.points.min(axis=0), self.points.max(axis=0)) if n else (np.zeros(3), np.zeros(3))
+        self.extent = float(np.max(hi - lo)) or 1.0
+
+        self.tolerances = self.extent / 2.0 ** np.arange(1, max_level + 1)
+        self.significance = self._significance(self.tolerances[-1])
+        self.levels = [np.flatnonzero(self.significance >= tol) for tol in self.tolerances]
+
+    def __len__(self):
+        return len(self.points)
+
+    def _significance(self, min_tol):
+        n = len(self.points)
+        sig = np.zeros(n)
+        if n == 0:
+            return sig
+        sig[0] = sig[-1] = np.inf
+
+        # Breadth-first Douglas–Peucker: all open segments of one depth are split
+        # in a single vectorised pass. A child never outranks its parent so levels nest.
+        # Only vertices still being refined are carried from depth to depth: idx in
+        # path order with their coordinates p as rows, and seg mapping each to its open
+        # segment (a, b). Split vertices and those of finished segments drop out.
+        cols = np.ascontiguousarray(self.points.T)
+        a, b, parent = np.array([0]), np.array([n - 1]), np.array([np.inf])
+        idx = np.arange(1, n - 1)
+        p = cols[:, 1:n - 1].copy()
+        seg = np.zeros(len(idx), dtype=np.intp)
+        starts = np.zeros(min(len(idx), 1), dtype=np.intp)
+        while len(idx):
+            d2 = _segment_distance2(p, cols.take(a, axis=1), cols.take(b, axis=1), seg)
+
+            # First vertex of each segment at its maximum distance
+            dmax2 = np.maximum.reduceat(d2, starts)
+            hits = np.flatnonzero(d2 == dmax2.take(seg))
+            split = idx[hits[np.concatenate([[True], seg[hits][1:] != seg[hits][:-1]])]]
+
+            dmax = np.sqrt(dmax2)
+            open_ = dmax >= min_tol
+            sig[split[open_]] = np.minimum(dmax, parent)[open_]
+            split_of = split.take(seg)
+            keep = idx != split_of
+            if not open_.all():
+                keep &= open_.take(seg)
+            idx, seg, right = idx[keep], seg[keep], idx[keep] > split_of[keep]
+            if not len(idx):
+                break
+            p = p.compress(keep, axis=1)
+
+            # Segment s splits into 2s (a, split) and 2s + 1 (split, b); keep those with vertices left
+            child = 2 * seg + right
+            change = np.concatenate([[True], child[1:] != child[:-1]])
+            used = child[change]
+            a = np.column_stack([a, split]).ravel()[used]
+            b = np.column_stack([split, b]).ravel()[used]
+            parent = np.repeat(sig[split], 2)[used]
+            starts = np.flatnonzero(change)
+            seg = np.cumsum(change) - 1
+        return sig
+
+    def select(self, tolerance):
+        """Vertex indices of the coarsest level whose error is within ``tolerance``."""
+        k = int(np.searchsorted(-self.tolerances, -tolerance))
+        if k >= len(self.levels):
+            return np.arange(len(self.points))
+        return self.levels[k]
+
+
+def _segment_distance2(points, a, b, seg):
+    """Squared distance from each point to its segment ``a[:, seg]``–``b[:, seg]``; arrays hold x, y, z as rows."""
+    # take() is several times faster than fancy indexing along the second axis
+    ab = b - a
+    l2 = np.einsum("ij,ij->j", ab, ab)
+    inv = np.divide(1.0, l2, out=np.zeros_like(l2), where=l2 > 0)
+    v = points - a.take(seg, axis=1)
+    ab = ab.take(seg, axis=1)
+    t = np.einsum("ij,ij->j", v, ab)
+    t *= inv.take(seg)
+    np.clip(t, 0.0, 1.0, out=t)
+    v -= t * ab
+    return np.einsum("ij,ij->j", v, v)
+
+
+def crop_to_view(pixels, width, height):
+    """Mask of polyline vertices belonging to a segment that touches the pixel rectangle."""
+    if len(pixels) < 2:
+        return np.ones(len(pixels), dtype=bool)
+    a, b = pixels[:-1], pixels[1:]
+    lo, hi = np.minimum(a, b), np.maximum(a, b)
+    visible = (hi[:, 0] >= 0) & (lo[:, 0] <= width) & (hi[:, 1] >= 0) & (lo[:, 1] <= height)
+    keep = np.zeros(len(pixels), dtype=bool)
+    keep[:-1] |= visible
+    keep[1:] |= visible
+    return keep
+
+
+def declutter(pixels, cell_w, cell_h):
+    """Indices of the first point in each ``cell_w`` x ``cell_h`` pixel cell, in input order."""
+    if len(pixels) == 0:
+        return np.arange(0)
+    keys = np.floor(pixels / (cell_w, cell_h)).astype(np.int64)
+    _, first = np.unique(keys, axis=0, return_index=True)
+    return np.sort(first)
@@ -0,0 +1,119 @@
+import contextlib
+import csv
+import json
+import time
+import numpy as np
+
+# compute: frame positions, lookup: nearest-event search done on the GUI thread
+# (only when the prefetcher runs dry), details: label and status text updates
+STAGES = ("compute", "lookup", "details", "draw", "blit")
+
+
+class FrameProfiler:
+    """Per-frame stage timings kept in a fixed-size ring buffer.
+
+    Code under measurement wraps each stage in ``with profiler.stage(name):``
+    and calls ``end_frame()`` once per frame. Only the last ``capacity``
+    frames are kept. While disabled, ``stage`` returns a shared no-op
+    context, so instrumented code costs next to nothing.
+    """
+
+    def __init__(self, capacity=600, stages=STAGES, enabled=False):
+        self.stages = tuple(stages)
+        self.capacity = capacity
+        self.enabled = enabled
+
+        # Columns: frame start time, total frame time, then one per stage (seconds)
+        self._rows = np.zeros((capacity, 2 + len(self.stages)))
+        self._current = np.zeros(len(self.stages))
+        self._frame_start = None
+        self._count = 0
+        self._null = contextlib.nullcontext()
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    def reset(self):
+        self._count = 0
+        self._frame_start = None
+        self._current[:] = 0
+
+    @contextlib.contextmanager
+    def _timed(self, column):
+        if self._frame_start is None:
+            self._frame_start = time.perf_counter()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._current[column] += time.perf_counter() - start
+
+    def stage(self, name):
+        if not self.enabled:
+            return self._null
+        return self._timed(self.stages.index(name))
+
+    def end_frame(self):
+        if not self.enabled or self._frame_start is None:
+            return
+        now = time.perf_counter()
+        row = self._rows[self._count % self.capacity]
+        row[0] = self._frame_start
+        row[1] = now - self._frame_start
+        row[2:] = self._current
+        self._count += 1
+        self._current[:] = 0
+        self._frame_start = None
+
+    def _ordered(self):
+        """Recorded rows, oldest first."""
+        n = len(self)
+        if self._count <= self.capacity:
+            return self._rows[:n]
+        split = self._count % self.capacity
+        return np.concatenate([self._rows[split:], self._rows[:split]])
+
+    def stats(self):
+        """Rolling frame-time percentiles and mean stage times in milliseconds, plus FPS."""
+        rows = self._ordered()
+        if len(rows) == 0:
+            return None
+        frame_ms = rows[:, 1] * 1000
+        p50, p95, p99 = np.percentile(frame_ms, (50, 95, 99))
+        span = rows[-1, 0] - rows[0, 0]
+        fps = (len(rows) - 1) / span if span > 0 else 0.0
+        return {
+            "frames": len(rows),
+            "fps": fps,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+            "stages": {name: rows[:, 2 + i].mean() * 1000 for i, name in enumerate(self.stages)},
+        }
+
+    def summary(self):
+        stats = self.stats()
+        if stats is None:
+            return "Profiler: waiting for frames"
+        stages = "  ".join(f"{name} {ms:.2f}" for name, ms in stats["stages"].items())
+        return (
+            f"{stats['fps']:.1f} FPS   frame p50 {stats['p50']:.1f} / p95 {stats['p95']:.1f}"
+            f" / p99 {stats['p99']:.1f} ms\n{stages} ms"
+        )
+
+    def dump(self, path):
+        """Write the recorded frames as CSV, or JSON if ``path`` ends in ``.json``."""
+        rows = self._ordered()
+        columns = ("start_s", "frame_ms") + tuple(f"{name}_ms" for name in self.stages)
+        values = rows.copy()
+        values[:, 0] -= values[0, 0] if len(values) else 0.0
+        values[:, 1:] *= 1000
+
+        if str(path).endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"stats": self.stats(), "columns": columns, "frames": values.tolist()}, f)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                writer.writerows(values.tolist())
@@ -0,0 +1,405 @@
+# voyager_propagate.py
+"""Physically based trajectories: N-body propagation between the waypoints.
+
+Each leg between two consecutive waypoints is a ballistic arc under the
+gravity of the Sun and the eight planets, integrated in heliocentric
+coordinates (km, km/s) with an adaptive Dormand-Prince 5(4) scheme. The
+planets follow analytic mean Keplerian elements (Standish, JPL; valid
+1800-2050), and waypoints are read as heliocentric ecliptic J2000
+positions with time in decimal years.
+
+A leg's start velocity is found by shooting: a two-body Lambert solution
+is refined with Newton steps until the integrated arc ends on the next
+waypoint. All Newton probes of a leg are integrated together as rows of
+one state array. The velocity change where two legs meet stands in for
+the flyby or course correction the waypoints imply. Legs touching a
+waypoint closer than ``min_radius`` to the Sun (such as a launch at the
+origin) cannot be integrated and are drawn straight.
+
+The result is sampled on a regular grid (hourly by default) plus the
+waypoint times and cached to disk per parameter set, so later loads
+memory-map it:
+
+    python voyager_propagate.py                   # propagate Voyager 1 into the cache
+    python voyager_propagate.py --csv v1.csv      # ...and export it as an ephemeris CSV
+    python main.py --propagate                    # fly Voyager 1 along it
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+from voyager_ephemeris import EventTable, event_arrays
+
+# Bump when the propagation or the cache layout changes so stale results are rebuilt
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "propagation_cache")
+
+AU = 149_597_870.7  # km
+YEAR = 365.25 * 86400.0  # Julian year, s
+GM_SUN = 1.32712440018e11  # km^3/s^2
+
+# === Planetary ephemerides ===
+# Mean elements at J2000 and their rates per Julian century:
+# a (AU), e, inclination, mean longitude, longitude of perihelion, longitude of the node (deg)
+PLANETS = ("Mercury", "Venus", "Earth", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune")
+_ELEMENTS = np.array([
+    [0.38709927, 0.20563593, 7.00497902, 252.25032350, 77.45779628, 48.33076593],
+    [0.72333566, 0.00677672, 3.39467605, 181.97909950, 131.60246718, 76.67984255],
+    [1.00000261, 0.01671123, -0.00001531, 100.46457166, 102.93768193, 0.0],
+    [1.52371034, 0.09339410, 1.84969142, -4.55343205, -23.94362959, 49.55953891],
+    [5.20288700, 0.04838624, 1.30439695, 34.39644051, 14.72847983, 100.47390909],
+    [9.53667594, 0.05386179, 2.48599187, 49.95424423, 92.59887831, 113.66242448],
+    [19.18916464, 0.04725744, 0.77263783, 313.23810451, 170.95427630, 74.01692503],
+    [30.06992276, 0.00859048, 1.77004347, -55.12002969, 44.96476227, 131.78422574],
+])
+_RATES = np.array([
+    [0.00000037, 0.00001906, -0.00594749, 149472.67411175, 0.16047689, -0.12534081],
+    [0.00000390, -0.00004107, -0.00078890, 58517.81538729, 0.00268329, -0.27769418],
+    [0.00000562, -0.00004392, -0.01294668, 35999.37244981, 0.32327364, 0.0],
+    [0.00001847, 0.00007882, -0.00813131, 19140.30268499, 0.44441088, -0.29257343],
+    [-0.00011607, -0.00013253, -0.00183714, 3034.74612775, 0.21252668, 0.20469106],
+    [-0.00125060, -0.00050991, 0.00193609, 1222.49362201, -0.41897216, -0.28867794],
+    [-0.00196176, -0.00004397, -0.00242939, 428.48202785, 0.40805281, 0.04240589],
+    [0.00026291, 0.00005105, 0.00035372, 218.45945325, -0.32241464, -0.00508664],
+])
+# Earth is the Earth-Moon barycentre, carrying the Moon's mass too
+GM_PLANETS = np.array([2.2032e4, 3.24859e5, 4.03503e5, 4.282837e4, 1.26686534e8, 3.7931187e7, 5.793939e6, 6.836529e6])
+
+
+def planet_positions(years):
+    """Heliocentric planet positions (km) at decimal year(s): shape ``(..., 8, 3)``."""
+    centuries = (np.asarray(years, dtype=np.float64) - 2000.0) / 100.0
+    elements = _ELEMENTS + _RATES * centuries[..., None, None]
+    a, e, inc, mean_lon, peri, node = np.moveaxis(elements, -1, 0)
+    inc, mean_lon, peri, node = np.radians(inc), np.radians(mean_lon), np.radians(peri), np.radians(node)
+
+    mean_anomaly = np.remainder(mean_lon - peri + np.pi, 2 * np.pi) - np.pi
+    ecc_anomaly = mean_anomaly + e * np.sin(mean_anomaly)
+    for _ in range(5):  # Newton on Kepler's equation; e < 0.21 converges well within this
+        ecc_anomaly -= (ecc_anomaly - e * np.sin(ecc_anomaly) - mean_anomaly) / (1 - e * np.cos(ecc_anomaly))
+
+    x = a * (np.cos(ecc_anomaly) - e)
+    y = a * np.sqrt(1 - e * e) * np.sin(ecc_anomaly)
+    arg = peri - node
+    cw, sw, cn, sn, ci, si = np.cos(arg), np.sin(arg), np.cos(node), np.sin(node), np.cos(inc), np.sin(inc)
+    return AU * np.stack([
+        (cw * cn - sw * sn * ci) * x - (sw * cn + cw * sn * ci) * y,
+        (cw * sn + sw * cn * ci) * x + (cw * cn * ci - sw * sn) * y,
+        sw * si * x + cw * si * y,
+    ], axis=-1)
+
+
+def _derivative(states, planets):
+    """``d/dt`` of ``(m, 6)`` heliocentric states with the planets at ``planets`` (8, 3)."""
+    r = states[:, :3]
+    offsets = planets - r[:, None, :]
+    accel = -GM_SUN * r / np.sum(r * r, axis=1, keepdims=True) ** 1.5
+    accel += np.einsum("p,mpk->mk", GM_PLANETS, offsets / np.sum(offsets * offsets, axis=2, keepdims=True) ** 1.5)
+    # Indirect term: the planets also pull on the Sun, which is the frame's origin
+    accel -= GM_PLANETS @ (planets / np.sum(planets * planets, axis=1, keepdims=True) ** 1.5)
+    return np.concatenate([states[:, 3:], accel], axis=1)
+
+
+# === Integrator ===
+# Dormand-Prince 5(4) tableau; the last row of _A is also the 5th-order solution
+_C = np.array([1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0])
+_A = [
+    np.array([1 / 5]),
+    np.array([3 / 40, 9 / 40]),
+    np.array([44 / 45, -56 / 15, 32 / 9]),
+    np.array([19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729]),
+    np.array([9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656]),
+    np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]),
+]
+_ERROR = np.array([71 / 57600, 0.0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40])
+_ATOL = np.array([1e-3, 1e-3, 1e-3, 1e-9, 1e-9, 1e-9])  # km, km/s
+
+
+def integrate(start, end, states, rtol=1e-9, record=False):
+    """Propagate ``(m, 6)`` states (km, km/s) from decimal year ``start`` to ``end``.
+
+    All rows share one adaptive step, sized for the least accurate row.
+    Returns the final states and, with ``record``, the accepted step
+    times (decimal years) and the first row's state at each of them.
+    """
+    y = np.array(states, dtype=np.float64).reshape(-1, 6)
+    span = (end - start) * YEAR
+    t, h = 0.0, min(span, 86400.0)
+    k = np.empty((7,) + y.shape)
+    k[0] = _derivative(y, planet_positions(start))
+    times, path = [0.0], [y[0].copy()]
+
+    while t < span:
+        h = min(h, span - t)
+        # One ephemeris call places the planets for every stage of the step
+        planets = planet_positions(start + (t + _C * h) / YEAR)
+        for stage, row in enumerate(_A[:-1]):
+            k[stage + 1] = _derivative(y + h * np.tensordot(row, k[:stage + 1], 1), planets[stage])
+        y_new = y + h * np.tensordot(_A[-1], k[:6], 1)
+        k[6] = _derivative(y_new, planets[-1])
+
+        scale = _ATOL + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        error = np.sqrt(np.mean((h * np.tensordot(_ERROR, k, 1) / scale) ** 2, axis=1)).max()
+        if not np.isfinite(error):
+            raise ValueError(f"Integration failed at {start + t / YEAR:g}")
+        if error <= 1.0:
+            t += h
+            y = y_new
+            k[0] = k[6]  # First same as last
+            if record:
+                times.append(t)
+                path.append(y[0].copy())
+        h *= min(5.0, max(0.2, 0.9 * error ** -0.2)) if error > 0 else 5.0
+
+    if not record:
+        return y
+    return y, start + np.array(times) / YEAR, np.array(path)
+
+
+# === Shooting ===
+def _stumpff(z):
+    if z > 0:
+        s = math.sqrt(z)
+        return (s - math.sin(s)) / s ** 3, (1 - math.cos(s)) / z
+    if z < 0:
+        s = math.sqrt(-z)
+        return (math.sinh(s) - s) / s ** 3, (math.cosh(s) - 1) / -z
+    return 1 / 6, 1 / 2
+
+
+def lambert(r1, r2, seconds, mu=GM_SUN):
+    """Start velocity (km/s) of the two-body arc from ``r1`` to ``r2`` in ``seconds``.
+
+    The arc sweeps the smaller angle between the two positions, so it
+    follows the direction the waypoints move in. Universal-variable
+    formulation, solved by bisection; raises
+    ValueError when the geometry is degenerate (the two positions on one
+    line through the Sun).
+    """
+    r1, r2 = np.asarray(r1, dtype=np.float64), np.asarray(r2, dtype=np.float64)
+    n1, n2 = np.linalg.norm(r1), np.linalg.norm(r2)
+    if n1 == 0 or n2 == 0:
+        raise ValueError("Lambert arc is undefined through the Sun")
+    cos_angle = np.clip(r1 @ r2 / (n1 * n2), -1.0, 1.0)
+    angle = math.acos(cos_angle)
+    if 1 - cos_angle < 1e-12 or math.sin(angle) < 1e-9:
+        raise ValueError("Lambert arc is undefined for collinear positions")
+    A = math.sin(angle) * math.sqrt(n1 * n2 / (1 - cos_angle))
+
+    def y_of(z):
+        S, C = _stumpff(z)
+        return n1 + n2 + A * (z * S - 1) / math.sqrt(C)
+
+    def time_error(z):
+        S, C = _stumpff(z)
+        if C <= 0:  # Rounding at the single-revolution limit z = 4 pi^2
+            return math.inf
+        y = n1 + n2 + A * (z * S - 1) / math.sqrt(C)
+        if y < 0:
+            return -math.inf
+        return ((y / C) ** 1.5 * S + A * math.sqrt(y)) / math.sqrt(mu) - seconds
+
+    lo, hi = -4 * math.pi ** 2, 4 * math.pi ** 2 - 1e-9
+    while time_error(lo) > 0:
+        lo *= 2
+        if lo < -1e5:
+            raise ValueError("Lambert arc did not converge")
+    for _ in range(200):
+        mid = 0.5 * (lo + hi)
+        if time_error(mid) > 0:
+            hi = mid
+        else:
+            lo = mid
+    y = y_of(lo)
+    f = 1 - y / n1
+    g = A * math.sqrt(y / mu)
+    return (r2 - f * r1) / g
+
+
+def shoot_leg(start, end, r0, r1, rtol=1e-9, tolerance=10.0, max_iter=8):
+    """Integrated arc from ``r0`` at ``start`` to ``r1`` at ``end`` (decimal years, km).
+
+    Returns ``(times, states, miss)``: the accepted integrator steps, the
+    state at each and the final distance from ``r1`` in km. Raises
+    ValueError if Newton's method does not get within ``tolerance`` km.
+    """
+    r0, r1 = np.asarray(r0, dtype=np.float64), np.asarray(r1, dtype=np.float64)
+    seconds = (end - start) * YEAR
+    try:
+        v = lambert(r0, r1, seconds)
+    except ValueError:
+        v = (r1 - r0) / seconds
+
+    for _ in range(max_iter):
+        # Row 0 is the current guess; rows 1-3 nudge one velocity component each
+        eps = max(1e-7 * np.linalg.norm(v), 1e-8)
+        states = np.tile(np.concatenate([r0, v]), (4, 1))
+        states[1:, 3:] += eps * np.eye(3)
+        final, times, path = integrate(start, end, states, rtol, record=True)
+        miss = final[0, :3] - r1
+        if np.linalg.norm(miss) <= tolerance:
+            return times, path, float(np.linalg.norm(miss))
+        jacobian = (final[1:, :3] - final[0, :3]).T / eps
+        v = v - np.linalg.solve(jacobian, miss)
+        if not np.all(np.isfinite(v)):
+            break
+    raise ValueError(f"Leg {start:g}-{end:g} did not converge")
+
+
+def _straight_leg(start, end, r0, r1):
+    velocity = (r1 - r0) / ((end - start) * YEAR)
+    return np.array([start, end]), np.array([np.concatenate([r0, velocity]), np.concatenate([r1, velocity])])
+
+
+def _sample(knot_times, knot_states, times):
+    """Cubic Hermite positions through the step states, using their velocities as slopes."""
+    i = np.clip(np.searchsorted(knot_times, times, side="right") - 1, 0, len(knot_times) - 2)
+    t0, t1 = knot_times[i], knot_times[i + 1]
+    h = np.where(t1 > t0, t1 - t0, 1.0)
+    s = ((times - t0) / h)[:, None]
+    span = (h * YEAR)[:, None]
+    p0, p1 = knot_states[i, :3], knot_states[i + 1, :3]
+    m0, m1 = knot_states[i, 3:] * span, knot_states[i + 1, 3:] * span
+    s2, s3 = s * s, s * s * s
+    return (2 * s3 - 3 * s2 + 1) * p0 + (s3 - 2 * s2 + s) * m0 + (3 * s2 - 2 * s3) * p1 + (s3 - s2) * m1
+
+
+# === Propagation and cache ===
+def propagate(events, step_hours=1.0, rtol=1e-9, min_radius=0.05 * AU, progress=None):
+    """Propagate every leg between the ``events`` waypoints.
+
+    Returns ``(table, info)``: an ``EventTable`` sampled every
+    ``step_hours`` plus at each waypoint (labelled with its event name;
+    other samples are unlabelled), and a dict describing the legs.
+    """
+    from voyager_trajectory import Trajectory
+
+    trajectory = Trajectory(events)
+    times, positions = trajectory.times, trajectory.positions
+    knot_times, knot_states, straight, misses, steps = [], [], [], [], 0
+    legs = len(times) - 1
+    for leg in range(legs):
+        if progress is not None:
+            progress(f"Propagating leg {leg + 1}/{legs}", leg / max(legs, 1))
+        start, end, r0, r1 = times[leg], times[leg + 1], positions[leg], positions[leg + 1]
+        arc = None
+        if min(np.linalg.norm(r0), np.linalg.norm(r1)) >= min_radius:
+            try:
+                arc_times, arc_states, miss = shoot_leg(start, end, r0, r1, rtol)
+                arc = (arc_times, arc_states)
+                misses.append(miss)
+                steps += len(arc_times) - 1
+            except ValueError:
+                pass
+        if arc is None:
+            arc = _straight_leg(start, end, r0, r1)
+            straight.append(leg)
+        knot_times.append(arc[0])
+        knot_states.append(arc[1])
+
+    knot_times, knot_states = np.concatenate(knot_times), np.concatenate(knot_states)
+    step = step_hours / (24 * 365.25)
+    grid = np.union1d(np.arange(times[0], times[-1], step), times)
+    columns = np.empty((4, len(grid)))
+    columns[0] = grid
+    columns[1:] = _sample(knot_times, knot_states, grid).T
+    columns[1:, np.searchsorted(grid, times)] = positions.T  # Land exactly on the waypoints
+
+    names = [events[i]["event"] for i in trajectory.event_ids]
+    labels = [""] + sorted(set(names) - {""})
+    label_ids = np.zeros(len(grid), dtype=np.int32)
+    label_ids[np.searchsorted(grid, times)] = [labels.index(n) for n in names]
+
+    info = {
+        "legs": legs,
+        "straight_legs": straight,
+        "integrator_steps": steps,
+        "max_miss_km": max(misses, default=0.0),
+    }
+    return EventTable(columns, label_ids, labels), info
+
+
+def cache_key(events, step_hours=1.0, rtol=1e-9, min_radius=0.05 * AU):
+    """Hash of everything a propagation result depends on."""
+    times, coords = event_arrays(events)
+    digest = hashlib.sha1()
+    digest.update(json.dumps([CACHE_VERSION, step_hours, rtol, min_radius, [e["event"] for e in events]]).encode())
+    digest.update(np.ascontiguousarray(times).tobytes())
+    digest.update(np.ascontiguousarray(coords).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def propagate_events(events, cache_dir=None, step_hours=1.0, rtol=1e-9, min_radius=0.05 * AU, progress=None):
+    """``propagate`` through a disk cache keyed by the waypoints and parameters.
+
+    The first call for a parameter set integrates and writes ``.npy``
+    files; later calls memory-map them.
+    """
+    folder = cache_dir or DEFAULT_CACHE_DIR
+    stem = os.path.join(folder, "propagated-" + cache_key(events, step_hours, rtol, min_radius))
+    cols_path, labels_path, meta_path = stem + ".cols.npy", stem + ".labels.npy", stem + ".meta.json"
+
+    meta = None
+    if os.path.exists(meta_path) and os.path.exists(cols_path) and os.path.exists(labels_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+    if meta is None:
+        table, info = propagate(events, step_hours, rtol, min_radius, progress)
+        os.makedirs(folder, exist_ok=True)
+        # Per-process temporary names: concurrent first loads must not write into each other's files
+        tmp = f".{os.getpid()}.tmp"
+        for path, array in ((cols_path, table.columns), (labels_path, table.label_ids)):
+            with open(path + tmp, "wb") as f:
+                np.save(f, array)
+            os.replace(path + tmp, path)
+        meta = {
+            "version": CACHE_VERSION,
+            "step_hours": step_hours,
+            "rtol": rtol,
+            "min_radius_km": min_radius,
+            "rows": len(table),
+            "labels": table.labels,
+            **info,
+        }
+        with open(meta_path + tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + tmp, meta_path)
+
+    return EventTable(
+        np.load(cols_path, mmap_mode="r"),
+        np.load(labels_path, mmap_mode="r"),
+        meta["labels"],
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Propagate waypoints under the Sun's and planets' gravity")
+    parser.add_argument("--data", help="CSV ephemeris of waypoints (default: the built-in Voyager 1 events)")
+    parser.add_argument("--cache-dir", help=f"Directory for propagation results (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--step-hours", type=float, default=1.0, help="Output sample spacing (default: 1)")
+    parser.add_argument("--rtol", type=float, default=1e-9, help="Integrator relative tolerance")
+    parser.add_argument("--csv", help="Also write the samples to this ephemeris CSV")
+    args = parser.parse_args(argv)
+
+    from Voyager_data import load_events
+
+    events = load_events(args.data, cache_dir=args.cache_dir)
+    start = time.perf_counter()
+    table = propagate_events(events, args.cache_dir, args.step_hours, args.rtol)
+    print(f"{len(table)} samples over {len(events)} waypoints in {time.perf_counter() - start:.2f} s", file=sys.stderr)
+
+    if args.csv:
+        with open(args.csv, "w") as f:
+            f.write("time,x,y,z,event\n")
+            for t, x, y, z, label in zip(*table.columns.tolist(), table.label_ids.tolist()):
+                f.write(f"{t:.9f},{x:.6e},{y:.6e},{z:.6e},{table.labels[label]}\n")
+
+
+if __name__ == "__main__":
+    main()
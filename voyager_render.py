@@ -0,0 +1,199 @@
+# voyager_render.py
+"""Headless frame rendering for videos and dashboards.
+
+Renders the trajectory animation offscreen on the Agg backend, with no
+QApplication, and spreads chunks of frames across a process pool:
+
+    python voyager_render.py --frames 600 --size 1920x1080 --out frames/
+    python voyager_render.py --frames 600 --video voyager.mp4 --fps 30
+    python voyager_render.py --frames 600 --raw | ffmpeg -f rawvideo -pix_fmt rgba -s 1280x720 -i - out.mp4
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import matplotlib.image as mpimg
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from Voyager_data import companion_craft, load_events
+from voyager_scene import VoyagerScene
+
+
+class HeadlessPlot(VoyagerScene, FigureCanvasAgg):
+    """``VoyagerScene`` on an offscreen Agg canvas of a fixed pixel size."""
+
+    def __init__(self, size=(1280, 720), dpi=100, mode="3D", dark_mode=True,
+                 interpolation="linear", events=None, num_steps=500, fleet=None, trail=True, track=None):
+        width, height = size
+        fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi,
+                     facecolor="black" if dark_mode else "white")
+        super().__init__(fig)
+
+        self._init_scene(
+            mode=mode, dark_mode=dark_mode, interpolation=interpolation,
+            events=events, num_steps=num_steps, fleet=fleet, trail=trail, track=track,
+        )
+
+    def render_frame(self, index):
+        """Draw animation step ``index`` and return the canvas as an RGBA array."""
+        self.current_index = index
+        self.plot_trajectory()
+        return np.asarray(self.buffer_rgba())
+
+
+# === Process pool workers ===
+_worker_plot = None
+
+# Raw frames travel back from the workers one chunk per pickled blob; this caps a chunk's size
+MAX_CHUNK_BYTES = 16 * 2**20
+
+
+def _init_worker(options):
+    global _worker_plot
+    options = dict(options)
+    cache_dir = options.pop("cache_dir")
+    events = load_events(options.pop("data"), cache_dir=cache_dir)
+    track = None
+    if options.pop("propagate"):
+        from voyager_propagate import propagate_events
+        track = propagate_events(events, cache_dir=cache_dir)
+    fleet = companion_craft() if options.pop("fleet") else None
+    _worker_plot = HeadlessPlot(events=events, fleet=fleet, track=track, **options)
+
+
+def _render_chunk(start, stop, out_dir):
+    """Render frames ``[start, stop)``; write PNGs to ``out_dir`` or return raw RGBA bytes."""
+    raw = []
+    for i in range(start, stop):
+        frame = _worker_plot.render_frame(i)
+        if out_dir is not None:
+            mpimg.imsave(os.path.join(out_dir, f"frame_{i:06d}.png"), frame)
+        else:
+            raw.append(frame.tobytes())
+    return b"".join(raw)
+
+
+def render_frames(frames, workers=None, chunk_size=None, out_dir=None, sink=None, **options):
+    """Render ``frames`` animation steps across a process pool.
+
+    Frames are written as PNGs into ``out_dir``, or as raw RGBA bytes to
+    ``sink`` in frame order, with at most two chunks per worker in flight.
+    ``options`` are passed to ``HeadlessPlot``, plus ``data``/``cache_dir``
+    to load an ephemeris, ``propagate`` to move Voyager 1 along its N-body
+    propagation and ``fleet`` to add the companion craft in each worker.
+
+    Returns the elapsed wall time in seconds.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, min(32, frames // (workers * 4)))
+    if sink is not None:
+        width, height = options.get("size", (1280, 720))
+        chunk_size = max(1, min(chunk_size, MAX_CHUNK_BYTES // (width * height * 4)))
+    options = {"data": None, "cache_dir": None, "propagate": False, "fleet": False, **options, "num_steps": frames}
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+    if options["propagate"]:
+        # Propagate once here so the workers all memory-map the cached result
+        from voyager_propagate import propagate_events
+        events = load_events(options["data"], cache_dir=options["cache_dir"])
+        propagate_events(events, cache_dir=options["cache_dir"])
+
+    chunks = iter([(a, min(a + chunk_size, frames)) for a in range(0, frames, chunk_size)])
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(options,)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_render_chunk, *chunk, out_dir))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            data = pending.popleft().result()
+            if sink is not None:
+                sink.write(data)
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append(pool.submit(_render_chunk, *chunk, out_dir))
+    return time.perf_counter() - start
+
+
+def _open_ffmpeg(path, size, fps):
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return None
+    width, height = size
+    return subprocess.Popen(
+        [ffmpeg, "-y", "-loglevel", "error",
+         "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+         "-pix_fmt", "yuv420p", path],
+        stdin=subprocess.PIPE,
+    )
+
+
+def _parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render Voyager animation frames without a display")
+    parser.add_argument("--frames", type=int, default=500, help="Number of frames across the whole trajectory")
+    parser.add_argument("--size", type=_parse_size, default=(1280, 720), help="Frame size as WIDTHxHEIGHT pixels")
+    parser.add_argument("--dpi", type=int, default=100)
+    parser.add_argument("--mode", choices=("3D", "2D"), default="3D")
+    parser.add_argument("--light", action="store_true", help="Use the light theme")
+    parser.add_argument("--interpolation", choices=("linear", "hermite"), default="linear")
+    parser.add_argument("--data", help="CSV ephemeris to render instead of the built-in events")
+    parser.add_argument("--cache-dir", help="Directory for the binary ephemeris cache")
+    parser.add_argument("--propagate", action="store_true", help="Render the N-body propagation of the waypoints")
+    parser.add_argument("--fleet", action="store_true", help="Also draw Voyager 2, the Pioneers and New Horizons")
+    parser.add_argument("--no-trail", action="store_true", help="Draw the marker without its fading trail")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Frames per worker task")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--out", default="frames", help="Directory for PNG frames (default: frames)")
+    output.add_argument("--video", help="Encode to this file through ffmpeg (falls back to PNGs if ffmpeg is missing)")
+    output.add_argument("--raw", action="store_true", help="Write raw RGBA frames to stdout")
+    parser.add_argument("--fps", type=int, default=30, help="Frame rate for --video")
+    args = parser.parse_args(argv)
+
+    options = {
+        "size": args.size, "dpi": args.dpi, "mode": args.mode, "dark_mode": not args.light,
+        "interpolation": args.interpolation, "data": args.data, "cache_dir": args.cache_dir,
+        "propagate": args.propagate, "fleet": args.fleet, "trail": not args.no_trail,
+    }
+
+    encoder = None
+    if args.video:
+        encoder = _open_ffmpeg(args.video, args.size, args.fps)
+        if encoder is None:
+            print("ffmpeg not found on PATH; writing PNG frames instead.", file=sys.stderr)
+
+    if encoder is not None:
+        elapsed = render_frames(args.frames, args.workers, args.chunk_size, sink=encoder.stdin, **options)
+        encoder.stdin.close()
+        encoder.wait()
+        target = args.video
+    elif args.raw:
+        elapsed = render_frames(args.frames, args.workers, args.chunk_size, sink=sys.stdout.buffer, **options)
+        sys.stdout.buffer.flush()
+        target = "stdout"
+    else:
+        elapsed = render_frames(args.frames, args.workers, args.chunk_size, out_dir=args.out, **options)
+        target = args.out
+
+    print(
+        f"Rendered {args.frames} frames to {target} in {elapsed:.2f}s "
+        f"({args.frames / elapsed:.1f} fps)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,580 @@
+import contextlib
+import functools
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.collections import LineCollection
+import matplotlib.image as mpimg
+from Voyager_data import VOYAGER_EVENTS
+from mpl_toolkits.mplot3d import proj3d
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+from voyager_fleet import Fleet
+from voyager_lod import PathLOD, crop_to_view, declutter
+from voyager_trail import Trail
+from voyager_trajectory import Trajectory
+
+# Marker and path colours for companion craft, cycled in fleet order
+CRAFT_COLORS = ["#ff006e", "#fb8500", "#8338ec", "#ffbe0b", "#06d6a0", "#ef476f"]
+
+
+@functools.lru_cache(maxsize=None)
+def ship_image(path="voyager_ship.png"):
+    """Decoded ship marker image, or None if it is missing; read from disk once per process."""
+    try:
+        img = mpimg.imread(path)
+    except Exception:
+        return None
+    img.setflags(write=False)  # Shared by every scene
+    return img
+
+
+@functools.lru_cache(maxsize=None)
+def colormap(name):
+    """Registered colormap by name, cached (the registry returns a fresh copy per lookup)."""
+    return colormaps[name]
+
+
+def prepare_data(events, fleet=None, interpolation="linear", num_steps=500, progress=None, track=None):
+    """Build everything a scene needs from its events, without touching matplotlib.
+
+    This is the expensive, thread-safe part of loading a dataset: the fleet
+    model, the per-step position table and the level-of-detail pyramids.
+    ``track`` is an optional dense sampling of Voyager 1's path (such as
+    an N-body propagation of ``events``) to draw and animate along; the
+    event markers and labels stay on ``events``. ``progress(text,
+    fraction)`` is called between stages when given.
+    """
+    report = progress or (lambda text, fraction: None)
+
+    # Voyager 1 is row 0; companion craft (name -> events) follow and share its timeline
+    report("Building trajectories", 0.2)
+    fleet = Fleet({"Voyager 1": events if track is None else track, **(fleet or {})}, method=interpolation)
+    primary = fleet.trajectories[0]
+    waypoints = primary if track is None else Trajectory(events, method=interpolation)
+
+    # For animation: every craft's position at each step, sampled evenly in time
+    path_t = np.linspace(primary.start, primary.end, num_steps)
+    fleet_path = fleet.positions_at(path_t)
+
+    # Multi-resolution paths so redraw cost follows what is visible, not the data size
+    report("Simplifying paths", 0.5)
+    lods = [PathLOD(t.positions) for t in fleet.trajectories]
+    event_lod = lods[0] if track is None else PathLOD(waypoints.positions)
+
+    return {
+        "events": events, "fleet": fleet, "waypoints": waypoints, "path_t": path_t,
+        "fleet_path": fleet_path, "lods": lods, "event_lod": event_lod,
+    }
+
+
+class VoyagerScene:
+    """Trajectory plot and marker animation, independent of the GUI toolkit.
+
+    Mixed into a matplotlib canvas class: ``VoyagerPlot`` for the Qt window,
+    ``HeadlessPlot`` for offscreen Agg rendering. The canvas is created first,
+    then ``_init_scene`` builds the plot.
+    """
+
+    def _init_scene(self, mode="3D", display_points=15, dark_mode=True, blit=True,
+                    interpolation="linear", events=None, num_steps=500, fleet=None, trail=True, track=None):
+        events = VOYAGER_EVENTS if events is None else events
+        self.mode = mode
+        self.interpolation = interpolation
+        self.display_points = display_points
+        self.dark_mode = dark_mode
+        self.blit_enabled = blit
+
+        # Cached static background (axes, path, events) for blitted animation
+        self._background = None
+
+        # Optional FrameProfiler; draw and blit times are recorded when set
+        self.profiler = None
+
+        # Live telemetry: the latest (time, x, y, z) samples replace the precomputed path
+        self.streaming = False
+        self._stream = None
+
+        # Fading trail of the marker's last animation steps, in a fixed-size ring buffer
+        self.trail = Trail(capacity=60)
+        self.trail_enabled = trail
+        self.trail_max_gap = 10  # A longer jump (seek, wrap) rebuilds the trail instead of extending it
+        self._trail_step = None
+
+        # Trajectories, animation table and LOD pyramids
+        self._apply_data(prepare_data(events, fleet, interpolation, num_steps, track=track))
+        self.lod_tolerance = 0.5   # Allowed path error in pixels
+        self.marker_spacing = 14   # Minimum pixel spacing between event markers
+        self.label_size = (48, 16) # Pixel cell reserved for one year label
+
+        # Voyager ship image (optional)
+        self.voyager_img = ship_image()
+
+        # Every full redraw (init, resize, view rotation) refreshes the background
+        self.mpl_connect("draw_event", self._on_draw)
+
+        self.init_plot()
+
+    def _apply_data(self, data):
+        self.events = data["events"]
+        self.fleet = data["fleet"]
+        self.trajectory = self.fleet.trajectories[0]
+        self.waypoints = data["waypoints"]  # Through the events; the same as trajectory unless a track was given
+        self.craft_enabled = np.ones(len(self.fleet), dtype=bool)
+        self._companions = np.arange(1, len(self.fleet))
+
+        self.num_steps = len(data["path_t"])
+        self.path_t = data["path_t"]
+        self.fleet_path = data["fleet_path"]
+        self.path_x, self.path_y, self.path_z = self.fleet_path[:, 0].T
+        self.current_index = 0
+
+        self.lod = data["lods"][0]
+        self.event_lod = data["event_lod"]
+        self.fleet_lods = data["lods"][1:]
+        self._trail_step = None
+
+    def set_data(self, data):
+        """Switch to a dataset from ``prepare_data`` and rebuild the plot (GUI thread only)."""
+        self._apply_data(data)
+        self.init_plot()
+
+    def init_plot(self):
+        """Rebuild the figure from scratch for the current mode and theme."""
+        self._background = None
+        self.figure.clear()
+        self._views = {}
+        self._activate(self.mode)
+
+    # === View cache ===
+    def _theme_colors(self):
+        if self.dark_mode:
+            return {"bg": "#0d1117", "text": "white", "path": "#3b82f6",
+                    "voyager": "#00f5d4", "grid": "#333", "edge": "white"}
+        return {"bg": "white", "text": "black", "path": "blue",
+                "voyager": "red", "grid": "#ccc", "edge": "black"}
+
+    def _build_view(self, mode):
+        """Create the axes and artists for one mode; they are kept and reused until init_plot."""
+        positions = self.fleet.positions
+        lo, hi = positions.min(axis=0), positions.max(axis=0)
+
+        # Path and event markers start empty; _update_lod fills them for the current view
+        if mode == "3D":
+            # === 3D VIEW ===
+            ax = self.figure.add_subplot(111, projection="3d")
+            path_line, = ax.plot([], [], [], linestyle="--", linewidth=2, label="Voyager Path")
+            event_markers = ax.scatter([], [], [], s=70, marker="o", color="#ffb703")
+
+            # Companion craft: one path collection and one marker collection for the whole fleet
+            fleet_paths = Line3DCollection([], linestyles=":", linewidths=1.5)
+            ax.add_collection3d(fleet_paths, autolim=False)
+            fleet_markers = ax.scatter([], [], [], s=100, marker="*")
+
+            # Trail: one collection, given the trail's segments on every step
+            trail_line = Line3DCollection(self.trail.segments, linewidths=2)
+            ax.add_collection3d(trail_line, autolim=False)
+
+            # Voyager marker (ship image or star)
+            if self.voyager_img is not None:
+                voyager_marker = ax.scatter([], [], [], s=0)  # Hidden placeholder
+                self.ship_img = self.voyager_img
+            else:
+                voyager_marker = ax.scatter([], [], [], s=120, marker="*", label="Voyager 1")
+
+            ax.auto_scale_xyz([lo[0], hi[0]], [lo[1], hi[1]], [lo[2], hi[2]])
+            ax.set_title("Voyager 1 Path (3D)", fontsize=13, pad=15)
+            ax.set_xlabel("X (km)")
+            ax.set_ylabel("Y (km)")
+            ax.set_zlabel("Z (km)")
+
+        else:
+            # === 2D VIEW ===
+            ax = self.figure.add_subplot(111)
+
+            # Voyager path
+            path_line, = ax.plot([], [], linestyle="--", linewidth=2.5, label="Voyager Path")
+
+            # Events, coloured by time along the mission
+            event_markers = ax.scatter([], [], s=100, linewidth=0.6, alpha=0.9, zorder=3)
+
+            # Companion craft: one path collection and one marker collection for the whole fleet
+            fleet_paths = LineCollection([], linestyles=":", linewidths=1.5, zorder=2)
+            ax.add_collection(fleet_paths, autolim=False)
+            fleet_markers = ax.scatter([], [], s=130, marker="*", linewidth=0.6, zorder=5)
+
+            # Trail: one collection, given the trail's segments on every step
+            trail_line = LineCollection(self.trail.segments_xy, linewidths=2.5, zorder=4)
+            ax.add_collection(trail_line, autolim=False)
+
+            # Voyager ship image marker
+            if self.voyager_img is not None:
+                voyager_marker = ax.imshow(self.voyager_img, extent=[0, 0, 0, 0], zorder=5)
+            else:
+                voyager_marker = ax.scatter(
+                    [], [], s=150, marker="*", edgecolor="white", linewidth=0.6, zorder=5
+                )
+
+            ax.update_datalim([lo[:2], hi[:2]])
+            ax.autoscale_view()
+            ax.set_title("Voyager 1 - XY Projection", fontsize=12, pad=10)
+            ax.set_xlabel("X (km)")
+            ax.set_ylabel("Y (km)")
+
+        # The markers and trail are excluded from full draws and blitted over the background
+        voyager_marker.set_animated(self.blit_enabled)
+        fleet_markers.set_animated(self.blit_enabled)
+        trail_line.set_animated(self.blit_enabled)
+
+        view = {
+            "mode": mode,
+            "ax": ax,
+            "path_line": path_line,
+            "event_markers": event_markers,
+            "voyager_marker": voyager_marker,
+            "fleet_paths": fleet_paths,
+            "fleet_markers": fleet_markers,
+            "trail": trail_line,
+            "legend": ax.legend(),
+            "labels": [],
+        }
+        limits = ("xlim_changed", "ylim_changed") + (("zlim_changed",) if mode == "3D" else ())
+        for name in limits:
+            ax.callbacks.connect(name, self._on_limits_changed)
+
+        self._style_view(view)
+        self._views[mode] = view
+        return view
+
+    def _style_view(self, view):
+        """Apply the current theme colours to an existing view's artists."""
+        c = self._theme_colors()
+        ax = view["ax"]
+        ax.set_facecolor(c["bg"])
+        ax.title.set_color(c["text"])
+        axes = (ax.xaxis, ax.yaxis, ax.zaxis) if view["mode"] == "3D" else (ax.xaxis, ax.yaxis)
+        for axis in axes:
+            axis.label.set_color(c["text"])
+        ax.tick_params(colors=c["text"])
+
+        view["path_line"].set_color(c["path"])
+        view["trail"].set_color(self.trail.colors(c["voyager"]))
+        if view["mode"] != "3D":
+            ax.grid(True, color=c["grid"], linestyle=":", linewidth=0.7)
+            view["event_markers"].set_edgecolor(c["edge"])
+            view["fleet_markers"].set_edgecolor(c["edge"])
+        if self.voyager_img is None:
+            view["voyager_marker"].set_facecolor(c["voyager"])
+            if view["mode"] == "3D":
+                view["voyager_marker"].set_edgecolor(c["voyager"])
+
+        legend = view["legend"]
+        legend.get_frame().set_facecolor(c["bg"])
+        legend.get_frame().set_edgecolor(c["text"])
+        for text in legend.get_texts():
+            text.set_color(c["text"])
+        for handle, color in zip(legend.legend_handles, (c["path"], c["voyager"])):
+            handle.set_color(color)
+
+        for label in view["labels"]:
+            label.set_color(c["text"])
+
+    def _activate(self, mode):
+        """Show the cached view for ``mode`` (building it if needed) and hide the others."""
+        view = self._views.get(mode) or self._build_view(mode)
+        for other in self._views.values():
+            other["ax"].set_visible(other is view)
+
+        self.mode = mode
+        self.ax = view["ax"]
+        self.path_line = view["path_line"]
+        self.event_markers = view["event_markers"]
+        self.voyager_marker = view["voyager_marker"]
+        self.fleet_paths = view["fleet_paths"]
+        self.fleet_markers = view["fleet_markers"]
+        self.trail_line = view["trail"]
+        self._labels = view["labels"]
+
+        # While streaming, the path changes every batch and is blitted with the markers
+        self.path_line.set_animated(self.streaming and self.blit_enabled)
+        # The live path already shows the recent history, so the trail is hidden while streaming
+        self.trail_line.set_visible(self.trail_enabled and not self.streaming)
+        self._trail_step = None
+        self._background = None
+        self._update_lod()
+        if self.streaming and self._stream is not None:
+            self._show_stream_path()
+        self._place_markers()
+        # On Qt this waits for the event loop, so a resize or the first show right after shares the draw
+        self.draw_idle()
+
+    def prepare_mode(self, mode):
+        """Build the view for ``mode`` ahead of time without showing it."""
+        if mode not in self._views:
+            self._build_view(mode)["ax"].set_visible(mode == self.mode)
+
+    # === Level of detail ===
+    def _on_limits_changed(self, ax):
+        if ax is self.ax:
+            self._update_lod()
+
+    def _to_pixels(self, points):
+        """Project data points to pixel offsets from the axes' lower-left corner."""
+        if self.mode == "3D":
+            px, py, _ = proj3d.proj_transform(points[:, 0], points[:, 1], points[:, 2], self.ax.get_proj())
+            xy = np.column_stack([px, py])
+        else:
+            xy = points[:, :2]
+        return self.ax.transData.transform(xy) - (self.ax.bbox.x0, self.ax.bbox.y0)
+
+    def _update_lod(self):
+        """Pick path detail, event markers and labels for the current limits and canvas size."""
+        width, height = max(self.ax.bbox.width, 1.0), max(self.ax.bbox.height, 1.0)
+        if self.mode == "3D":
+            spans = [hi - lo for lo, hi in (self.ax.get_xlim3d(), self.ax.get_ylim3d(), self.ax.get_zlim3d())]
+            per_pixel = max(spans) / min(width, height)
+        else:
+            (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+            per_pixel = max(abs(x1 - x0) / width, abs(y1 - y0) / height)
+
+        tolerance = self.lod_tolerance * per_pixel
+        self._update_fleet_paths(tolerance)
+
+        idx, pixels = self._visible(self.lod, tolerance, width, height)
+        path = self.lod.points[idx]
+        if self.event_lod is not self.lod:
+            idx, pixels = self._visible(self.event_lod, tolerance, width, height)
+
+        points = self.event_lod.points[idx]
+        markers = declutter(pixels, self.marker_spacing, self.marker_spacing)
+        labelled = markers[declutter(pixels[markers], *self.label_size)]
+        if len(labelled) > self.display_points:
+            labelled = labelled[np.linspace(0, len(labelled) - 1, self.display_points).astype(int)]
+
+        times = self.waypoints.times
+        text_color = self._theme_colors()["text"]
+        for label in self._labels:
+            label.remove()
+        self._labels.clear()
+
+        if self.mode == "3D":
+            if not self.streaming:
+                self.path_line.set_data_3d(path[:, 0], path[:, 1], path[:, 2])
+            self.event_markers._offsets3d = tuple(points[markers].T)
+            for k in labelled:
+                x, y, z = points[k]
+                self._labels.append(self.ax.text(x, y, z, self._year_label(idx[k]), fontsize=8, color=text_color))
+        else:
+            if not self.streaming:
+                self.path_line.set_data(path[:, 0], path[:, 1])
+            self.event_markers.set_offsets(points[markers, :2])
+            span = (times[-1] - times[0]) or 1.0
+            self.event_markers.set_facecolor(colormap("cool")((times[idx[markers]] - times[0]) / span))
+            for k in labelled:
+                x, y = points[k, :2]
+                self._labels.append(self.ax.text(
+                    x, y, self._year_label(idx[k]),
+                    color=text_color, fontsize=8, ha="center", va="bottom", zorder=4
+                ))
+
+    def _visible(self, lod, tolerance, width, height):
+        """Vertex indices of ``lod`` at ``tolerance`` and their pixel positions, cropped to the view in 2D."""
+        idx = lod.select(tolerance)
+        pixels = self._to_pixels(lod.points[idx])
+        if self.mode != "3D":
+            visible = crop_to_view(pixels, width, height)
+            idx, pixels = idx[visible], pixels[visible]
+        return idx, pixels
+
+    def _update_fleet_paths(self, tolerance):
+        dims = 3 if self.mode == "3D" else 2
+        lods = [self.fleet_lods[row - 1] for row in self._companions]
+        self.fleet_paths.set_segments([lod.points[lod.select(tolerance), :dims] for lod in lods])
+        colors = [self.craft_color(row) for row in self._companions]
+        self.fleet_paths.set_color(colors)
+        self.fleet_markers.set_facecolor(colors)
+        if self.mode == "3D":
+            self.fleet_markers.set_edgecolor(colors)
+
+    def craft_color(self, row):
+        """Colour of fleet row ``row`` (companions start at 1)."""
+        return CRAFT_COLORS[(row - 1) % len(CRAFT_COLORS)]
+
+    def set_craft_enabled(self, name, enabled):
+        """Show or hide a companion craft's path and marker."""
+        self.craft_enabled[self.fleet.index(name)] = enabled
+        self._companions = np.flatnonzero(self.craft_enabled[1:]) + 1
+        self._update_lod()
+        self._background = None
+        self.plot_trajectory()
+
+    def _year_label(self, knot):
+        return f"{self.events[self.waypoints.event_ids[knot]]['year']}"
+
+    def set_mode(self, mode):
+        self._activate(mode)
+
+    def set_trail(self, enabled):
+        """Show or hide the fading trail behind the Voyager marker."""
+        self.trail_enabled = enabled
+        self._trail_step = None
+        for view in self._views.values():
+            view["trail"].set_visible(enabled and not self.streaming)
+        self.plot_trajectory()
+
+    def set_view(self, elev, azim):
+        """Rotate the 3D camera to ``elev``/``azim`` degrees; ignored in 2D."""
+        if self.mode != "3D" or (self.ax.elev, self.ax.azim) == (elev, azim):
+            return
+        self.ax.view_init(elev=elev, azim=azim)
+        self._background = None
+        self._update_lod()
+    
+    def set_theme(self, dark_mode:bool):
+        """Update theme dynamically from UI toggle."""
+        self.dark_mode = dark_mode
+        self.figure.set_facecolor("black" if dark_mode else "white")
+        for view in self._views.values():
+            self._style_view(view)
+        self._background = None
+        self.plot_trajectory()
+
+    def plot_trajectory(self):
+        self._place_markers()
+        if self.blit_enabled and self._background is not None:
+            with self._stage("blit"):
+                self.restore_region(self._background)
+                self._draw_marker()
+                self.blit(self.figure.bbox)
+        else:
+            with self._stage("draw"):
+                self.draw()
+
+    def _place_markers(self):
+        if self.streaming and self._stream is not None:
+            # Companions are placed at the time of the latest live sample
+            t, x, y, z = self._stream[-1]
+            positions = self.fleet.positions_at(t)
+            positions[0] = x, y, z
+        else:
+            positions = self.fleet_path[self.current_index]
+            self._update_trail()
+        cx, cy, cz = positions[0]
+        companions = positions[self._companions]
+
+        if self.mode == "3D":
+            if self.voyager_img is None:
+                self.voyager_marker._offsets3d = ([cx], [cy], [cz])
+            self.fleet_markers._offsets3d = tuple(companions.T)
+        else:
+            self.fleet_markers.set_offsets(companions[:, :2])
+            if self.voyager_img is not None:
+                size = 0.3
+                self.voyager_marker.set_extent([cx - size, cx + size, cy - size, cy + size])
+            else:
+                self.voyager_marker.set_offsets([[cx, cy]])
+
+    def _update_trail(self):
+        """Extend the trail to the current step; jumps rebuild it from the precomputed path."""
+        step = self.current_index
+        if not self.trail_enabled or self.streaming or step == self._trail_step:
+            return
+        if self._trail_step is not None and 0 < step - self._trail_step <= self.trail_max_gap:
+            self.trail.push(self.fleet_path[step, 0])
+        else:
+            self.trail.reset(self.fleet_path[max(0, step - self.trail.capacity + 1):step + 1, 0])
+        self._trail_step = step
+        self.trail_line.set_segments(self.trail.segments if self.mode == "3D" else self.trail.segments_xy)
+
+    def _stage(self, name):
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.stage(name)
+
+    # === Blitting ===
+    def _on_draw(self, event):
+        """Cache the freshly drawn static scene and paint the marker on top."""
+        if not self.blit_enabled:
+            return
+        self._background = self.copy_from_bbox(self.figure.bbox)
+        self._draw_marker()
+
+    def _draw_marker(self):
+        artists = (self.trail_line, self.fleet_markers, self.voyager_marker)
+        if self.streaming and self.blit_enabled:
+            artists = (self.path_line,) + artists
+        for marker in artists:
+            if self.mode == "3D" and hasattr(marker, "do_3d_projection"):
+                marker.do_3d_projection()
+            self.ax.draw_artist(marker)
+
+    def show_step(self, step):
+        self.current_index = step % self.num_steps
+        self.plot_trajectory()
+
+    def move_forward(self):
+        self.current_index = (self.current_index + 1) % self.num_steps
+        self.plot_trajectory()
+
+    def show_time(self, time):
+        span = self.trajectory.end - self.trajectory.start
+        frac = (time - self.trajectory.start) / span if span else 0.0
+        self.current_index = int(np.clip(round(frac * (self.num_steps - 1)), 0, self.num_steps - 1))
+        self.plot_trajectory()
+
+    # === Live telemetry ===
+    def start_stream(self):
+        """Replace the precomputed path with live samples passed to ``update_stream``."""
+        self.streaming = True
+        self._stream = None
+        self._activate(self.mode)
+
+    def stop_stream(self):
+        """Return to the precomputed path and step animation."""
+        self.streaming = False
+        self._stream = None
+        self._activate(self.mode)
+
+    def update_stream(self, samples):
+        """Show ``(n, 4)`` time, x, y, z samples (oldest first) as the path, with the marker on the newest."""
+        if not len(samples):
+            return
+        self._stream = samples
+        self._show_stream_path()
+        if self._fit_stream_limits(samples[:, 1:]):
+            self._background = None
+        self.plot_trajectory()
+
+    def _show_stream_path(self):
+        x, y, z = self._stream[:, 1:].T
+        if self.mode == "3D":
+            self.path_line.set_data_3d(x, y, z)
+        else:
+            self.path_line.set_data(x, y)
+
+    def _fit_stream_limits(self, points):
+        """Grow the axes, with headroom, when samples leave them. Returns True if they changed."""
+        if self.mode == "3D":
+            limits = np.array([self.ax.get_xlim3d(), self.ax.get_ylim3d(), self.ax.get_zlim3d()])
+        else:
+            limits = np.array([self.ax.get_xlim(), self.ax.get_ylim()])
+        dims = len(limits)
+        lo, hi = points[:, :dims].min(axis=0), points[:, :dims].max(axis=0)
+        below, above = lo < limits[:, 0], hi > limits[:, 1]
+        if not (below.any() or above.any()):
+            return False
+
+        # Extend by a quarter of the new span so slow drift does not re-lay out the axes every batch
+        span = np.maximum(hi, limits[:, 1]) - np.minimum(lo, limits[:, 0])
+        limits[below, 0] = lo[below] - 0.25 * span[below]
+        limits[above, 1] = hi[above] + 0.25 * span[above]
+        setters = (self.ax.set_xlim, self.ax.set_ylim, getattr(self.ax, "set_zlim", None))
+        for setter, (a, b) in zip(setters, limits):
+            setter(a, b)
+        return True
+
+    def get_current_position(self):
+        return (
+            self.path_x[self.current_index],
+            self.path_y[self.current_index],
+            self.path_z[self.current_index],
+        )
+ 
\ No newline at end of file
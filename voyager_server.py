@@ -0,0 +1,393 @@
+# voyager_server.py
+"""HTTP service rendering trajectory frames as PNGs, for dashboards without Qt.
+
+    python voyager_server.py --port 8000 --workers 4 --disk-cache render_cache/
+
+    GET /frame.png?t=1990&mode=3D&theme=dark&elev=30&azim=-60&size=800x600
+    GET /stats      cache and render counters as JSON
+    GET /           a small page with a time slider, for trying it out
+
+Frames are rendered by ``HeadlessPlot`` in a process pool. Finished PNGs go
+into a memory LRU and an optional disk LRU, both bounded in bytes.
+Concurrent requests for a frame that is still rendering wait for that one
+render instead of starting their own.
+"""
+import argparse
+import hashlib
+import io
+import json
+import math
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+MODES = ("3D", "2D")
+THEMES = ("dark", "light")
+MAX_SIZE = 4096
+
+
+class BusyError(Exception):
+    """Raised when too many distinct frames are already waiting to render."""
+
+
+# === Process pool workers ===
+_worker_options = None
+_worker_data = None
+_worker_plots = OrderedDict()
+
+
+def _init_worker(options):
+    global _worker_options, _worker_data
+    from Voyager_data import companion_craft, load_events
+    _worker_options = dict(options)
+    events = load_events(_worker_options.pop("data"), cache_dir=_worker_options.pop("cache_dir"))
+    fleet = companion_craft() if _worker_options.pop("fleet") else None
+    _worker_data = {"events": events, "fleet": fleet}
+
+
+def _render_png(mode, theme, step, elev, azim, width, height):
+    """Render one frame and return it PNG-encoded. One plot per size is kept, restyled per request."""
+    import matplotlib.image as mpimg
+    from voyager_render import HeadlessPlot
+
+    dark = theme == "dark"
+    plot = _worker_plots.pop((width, height), None)
+    if plot is None:
+        plot = HeadlessPlot(size=(width, height), mode=mode, dark_mode=dark, **_worker_data, **_worker_options)
+    _worker_plots[(width, height)] = plot
+    while len(_worker_plots) > 4:
+        _worker_plots.popitem(last=False)
+
+    if plot.mode != mode:
+        plot.set_mode(mode)
+    if plot.dark_mode != dark:
+        plot.set_theme(dark)
+    plot.set_view(elev, azim)
+
+    buf = io.BytesIO()
+    mpimg.imsave(buf, plot.render_frame(step), format="png")
+    return buf.getvalue()
+
+
+# === Caches ===
+class RenderCache:
+    """Two-level LRU of encoded frames: memory, then an optional directory, each capped in bytes."""
+
+    def __init__(self, memory_bytes=64 * 2**20, disk_dir=None, disk_bytes=512 * 2**20):
+        self.memory_bytes = memory_bytes
+        self.disk_dir = disk_dir
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()
+        self._memory_used = 0
+        self._disk = OrderedDict()
+        self._disk_used = 0
+        self._lock = threading.Lock()
+
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+            # Resume the disk LRU from a previous run, oldest first by modification time
+            entries = [e for e in os.scandir(disk_dir) if e.name.endswith(".png")]
+            for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+                self._disk[entry.name] = entry.stat().st_size
+                self._disk_used += entry.stat().st_size
+
+    @staticmethod
+    def filename(key):
+        return hashlib.sha1(repr(key).encode()).hexdigest() + ".png"
+
+    def get(self, key):
+        """Return ``(png, level)`` with level ``"memory"`` or ``"disk"``, or ``(None, None)``."""
+        with self._lock:
+            png = self._memory.get(key)
+            if png is not None:
+                self._memory.move_to_end(key)
+                return png, "memory"
+            name = self.filename(key)
+            if name not in self._disk:
+                return None, None
+            self._disk.move_to_end(name)
+
+        path = os.path.join(self.disk_dir, name)
+        try:
+            with open(path, "rb") as f:
+                png = f.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._disk_used -= self._disk.pop(name, 0)
+            return None, None
+        self._put_memory(key, png)
+        return png, "disk"
+
+    def put(self, key, png):
+        self._put_memory(key, png)
+        if self.disk_dir is not None:
+            self._put_disk(key, png)
+
+    def _put_memory(self, key, png):
+        if len(png) > self.memory_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            self._memory_used -= len(old) if old is not None else 0
+            self._memory[key] = png
+            self._memory_used += len(png)
+            while self._memory_used > self.memory_bytes:
+                self._memory_used -= len(self._memory.popitem(last=False)[1])
+
+    def _put_disk(self, key, png):
+        name = self.filename(key)
+        path = os.path.join(self.disk_dir, name)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(png)
+        os.replace(tmp, path)
+
+        evicted = []
+        with self._lock:
+            self._disk_used += len(png) - self._disk.pop(name, 0)
+            self._disk[name] = len(png)
+            while self._disk_used > self.disk_bytes and len(self._disk) > 1:
+                old_name, size = self._disk.popitem(last=False)
+                self._disk_used -= size
+                evicted.append(old_name)
+        for old_name in evicted:
+            try:
+                os.remove(os.path.join(self.disk_dir, old_name))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory), "memory_bytes": self._memory_used,
+                "disk_entries": len(self._disk), "disk_bytes": self._disk_used,
+            }
+
+
+class RenderService:
+    """Serves frames from the cache, coalescing concurrent misses onto a single render."""
+
+    def __init__(self, workers=None, cache=None, steps=2000, max_pending=None, **options):
+        from Voyager_data import load_events
+        from voyager_trajectory import Trajectory
+
+        self.steps = steps
+        self.cache = cache or RenderCache()
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 8
+        options = {"data": None, "cache_dir": None, "fleet": False, **options, "num_steps": steps}
+        self.config = self.config_digest(options)
+
+        # The step grid the workers animate on; request times are snapped to it
+        trajectory = Trajectory(load_events(options["data"], cache_dir=options["cache_dir"]))
+        self.start, self.end = float(trajectory.start), float(trajectory.end)
+
+        self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(options,))
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "memory_hits": 0, "disk_hits": 0, "renders": 0, "coalesced": 0, "busy": 0}
+
+    @staticmethod
+    def config_digest(options):
+        """Hash of the render options and the data file's identity, so a disk cache never mixes configurations."""
+        source = options.get("data")
+        if source is not None:
+            stat = os.stat(source)
+            source = [os.path.abspath(source), stat.st_size, stat.st_mtime_ns]
+        config = json.dumps({**options, "data": source}, sort_keys=True, default=repr)
+        return hashlib.sha1(config.encode()).hexdigest()[:16]
+
+    def key(self, time=None, mode="3D", theme="dark", elev=30.0, azim=-60.0, size=(800, 600)):
+        """Normalised cache key; equivalent requests (same step, 2D at any angle) share one entry.
+
+        The key starts with ``config``, the digest of the service's render
+        options; the rest are ``_render_png`` arguments.
+        """
+        if mode not in MODES or theme not in THEMES:
+            raise ValueError(f"mode must be one of {MODES} and theme one of {THEMES}")
+        width, height = size
+        if not (16 <= width <= MAX_SIZE and 16 <= height <= MAX_SIZE):
+            raise ValueError(f"size must be between 16 and {MAX_SIZE} pixels per side")
+        time = self.start if time is None else time
+        if not all(math.isfinite(v) for v in (time, elev, azim)):
+            raise ValueError("t, elev and azim must be finite numbers")
+        frac = (time - self.start) / (self.end - self.start) if self.end > self.start else 0.0
+        step = round(min(max(frac, 0.0), 1.0) * (self.steps - 1))  # Clip first: a huge t overflows the product
+        if mode == "2D":
+            elev = azim = None
+        else:
+            elev, azim = round(float(elev), 1), round(float(azim), 1)
+        return (self.config, mode, theme, step, elev, azim, int(width), int(height))
+
+    def frame(self, key):
+        """PNG bytes for ``key``, rendering it at most once however many callers ask concurrently."""
+        with self._lock:
+            self.counters["requests"] += 1
+        png, level = self.cache.get(key)
+        if png is not None:
+            with self._lock:
+                self.counters[f"{level}_hits"] += 1
+            return png
+
+        submitted = False
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.counters["coalesced"] += 1
+            else:
+                # A render may have finished between the cache check and taking the lock
+                png, _ = self.cache.get(key)
+                if png is not None:
+                    return png
+                if len(self._inflight) >= self.max_pending:
+                    self.counters["busy"] += 1
+                    raise BusyError("render queue is full")
+                self.counters["renders"] += 1
+                future = self._pool.submit(_render_png, *key[1:])
+                self._inflight[key] = future
+                submitted = True
+        if submitted:
+            # Outside the lock: a future that is already done runs the callback right here
+            future.add_done_callback(lambda f, key=key: self._finished(key, f))
+        return future.result()
+
+    def _finished(self, key, future):
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(key, future.result())
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters, inflight=len(self._inflight), workers=self.workers)
+        stats.update(self.cache.stats())
+        return stats
+
+    def shutdown(self):
+        self._pool.shutdown(cancel_futures=True)
+
+
+# === HTTP ===
+_INDEX = """<!doctype html>
+<title>Voyager</title>
+<body style="background:#0d1117;color:#eee;font-family:sans-serif">
+<img id="frame" width="800" height="600"><br>
+<input id="t" type="range" min="{start}" max="{end}" step="0.05" value="{start}" style="width:800px">
+<select id="mode"><option>3D</option><option>2D</option></select>
+<select id="theme"><option>dark</option><option>light</option></select>
+<span id="label"></span>
+<script>
+const ids = ["t", "mode", "theme"], el = id => document.getElementById(id);
+function update() {{
+  const q = new URLSearchParams({{t: el("t").value, mode: el("mode").value, theme: el("theme").value, size: "800x600"}});
+  el("frame").src = "/frame.png?" + q; el("label").textContent = el("t").value;
+}}
+ids.forEach(id => el(id).addEventListener("input", update)); update();
+</script>
+"""
+
+
+class FrameHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so a dashboard reuses its connection
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/frame.png":
+            self._frame(parse_qs(url.query))
+        elif url.path == "/stats":
+            self._send(200, "application/json", json.dumps(self.server.service.stats()).encode())
+        elif url.path == "/":
+            service = self.server.service
+            self._send(200, "text/html", _INDEX.format(start=service.start, end=service.end).encode())
+        else:
+            self._send(404, "text/plain", b"not found\n")
+
+    def _frame(self, params):
+        service = self.server.service
+        get = lambda name, default: params.get(name, [default])[0]
+        try:
+            width, height = (int(v) for v in get("size", "800x600").lower().split("x"))
+            key = service.key(
+                time=float(get("t", service.start)), mode=get("mode", "3D"), theme=get("theme", "dark"),
+                elev=float(get("elev", 30.0)), azim=float(get("azim", -60.0)), size=(width, height),
+            )
+        except ValueError as exc:
+            self._send(400, "text/plain", f"bad request: {exc}\n".encode())
+            return
+
+        etag = f'"{RenderCache.filename(key)[:-4]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, None, b"", {"ETag": etag})
+            return
+        try:
+            png = service.frame(key)
+        except BusyError as exc:
+            self._send(503, "text/plain", f"{exc}\n".encode(), {"Retry-After": "1"})
+            return
+        except Exception as exc:
+            self._send(500, "text/plain", f"render failed: {exc}\n".encode())
+            return
+        self._send(200, "image/png", png, {"ETag": etag, "Cache-Control": "public, max-age=3600"})
+
+    def _send(self, status, content_type, body, headers=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(host="localhost", port=8000, verbose=False, **service_options):
+    """An HTTP server bound to ``host:port`` (0 picks a free port); call ``serve_forever`` to run it."""
+    server = ThreadingHTTPServer((host, port), FrameHandler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    server.service = RenderService(**service_options)
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve rendered Voyager frames over HTTP")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: all cores)")
+    parser.add_argument("--steps", type=int, default=2000, help="Time resolution: frames across the mission")
+    parser.add_argument("--cache-mb", type=float, default=64, help="Memory cache size in MB")
+    parser.add_argument("--disk-cache", help="Directory for the on-disk frame cache (default: memory only)")
+    parser.add_argument("--disk-mb", type=float, default=512, help="Disk cache size in MB")
+    parser.add_argument("--interpolation", choices=("linear", "hermite"), default="linear")
+    parser.add_argument("--data", help="CSV ephemeris to render instead of the built-in events")
+    parser.add_argument("--cache-dir", help="Directory for the binary ephemeris cache")
+    parser.add_argument("--fleet", action="store_true", help="Also draw Voyager 2, the Pioneers and New Horizons")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    cache = RenderCache(int(args.cache_mb * 2**20), args.disk_cache, int(args.disk_mb * 2**20))
+    server = make_server(
+        args.host, args.port, verbose=args.verbose, workers=args.workers, cache=cache, steps=args.steps,
+        interpolation=args.interpolation, data=args.data, cache_dir=args.cache_dir, fleet=args.fleet,
+    )
+    print(f"Serving frames on http://{args.host}:{server.server_address[1]}/", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import time
+
+
+class StartupTimer:
+    """Named checkpoints from launch to an interactive window.
+
+    Deliberately imports nothing heavy so it can be created before Qt,
+    NumPy or matplotlib are loaded.
+    """
+
+    def __init__(self):
+        self.marks = [("start", time.perf_counter())]
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+
+    def elapsed(self):
+        return self.marks[-1][1] - self.marks[0][1]
+
+    def report(self):
+        """One line per checkpoint: time since the previous one and since start, in ms."""
+        lines = ["Startup breakdown:"]
+        start = previous = self.marks[0][1]
+        for name, t in self.marks[1:]:
+            lines.append(f"  {name:<28}{(t - previous) * 1000:9.1f} ms{(t - start) * 1000:10.1f} ms")
+            previous = t
+        return "\n".join(lines)
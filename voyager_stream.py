@@ -0,0 +1,250 @@
+# voyager_stream.py
+"""Live position feeds: a bounded sample buffer, a reader thread and a stand-in feed.
+
+A feed is a stream of ``time,x,y,z`` lines (the ephemeris CSV format; an
+extra event column, headers and ``#`` comments are ignored) read from
+
+    tcp://HOST:PORT   a TCP socket, reconnecting if it drops
+    -                 standard input
+    PATH              a file, followed as it grows, or a named pipe
+
+To try the viewer without real telemetry, start the stand-in feed:
+
+    python voyager_stream.py --serve 9000 --rate 20    # then: python main.py --stream tcp://localhost:9000
+    python voyager_stream.py --file feed.csv --rate 20 # then: python main.py --stream feed.csv
+"""
+import argparse
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+
+import numpy as np
+
+
+class TelemetryBuffer:
+    """Fixed-capacity ring buffer of ``(time, x, y, z)`` samples.
+
+    A reader thread appends with ``extend``; the GUI thread takes ordered
+    copies with ``snapshot``. Once full, the oldest samples are overwritten.
+    ``version`` increases with every append, letting consumers skip redraws
+    when nothing arrived.
+    """
+
+    def __init__(self, capacity=50_000):
+        self.capacity = capacity
+        self.version = 0
+        self._rows = np.zeros((capacity, 4))
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self._total, self.capacity)
+
+    def extend(self, rows):
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, 4)[-self.capacity:]
+        n = len(rows)
+        if n == 0:
+            return
+        with self._lock:
+            start = self._total % self.capacity
+            first = min(n, self.capacity - start)
+            self._rows[start:start + first] = rows[:first]
+            self._rows[:n - first] = rows[first:]
+            self._total += n
+            self.version += 1
+
+    def snapshot(self):
+        """Buffered samples, oldest first, as a new ``(n, 4)`` array."""
+        with self._lock:
+            if self._total <= self.capacity:
+                return self._rows[:self._total].copy()
+            split = self._total % self.capacity
+            return np.concatenate([self._rows[split:], self._rows[:split]])
+
+
+def parse_lines(lines):
+    """``(n, 4)`` array from feed lines; headers, comments, malformed and non-finite lines are skipped."""
+    rows = []
+    for line in lines:
+        fields = line.split(",")
+        if len(fields) < 4 or line.lstrip().startswith("#"):
+            continue
+        try:
+            rows.append([float(f) for f in fields[:4]])
+        except ValueError:
+            continue
+    rows = np.array(rows, dtype=np.float64).reshape(-1, 4)
+    return rows[np.isfinite(rows).all(axis=1)]
+
+
+class TelemetryReader:
+    """Reads a feed on a daemon thread and appends parsed samples to a ``TelemetryBuffer``.
+
+    Lines are parsed and appended in batches: whatever arrived in one read,
+    flushed at least every ``flush_interval`` seconds. ``error`` holds the
+    last connection problem (or None) for display; the reader keeps
+    retrying until stopped.
+    """
+
+    def __init__(self, source, buffer, flush_interval=0.1, retry_interval=1.0):
+        self.source = source
+        self.buffer = buffer
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        self.received = 0
+        self.error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="voyager-telemetry", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._consume(self._chunks())
+            except OSError as exc:
+                self.error = str(exc) or type(exc).__name__
+            if not self._stop.is_set():
+                self._stop.wait(self.retry_interval)
+
+    def _consume(self, chunks):
+        partial, pending, last_flush = b"", [], time.monotonic()
+        for chunk in chunks:
+            self.error = None
+            if chunk:
+                *lines, partial = (partial + chunk).split(b"\n")
+                pending.extend(lines)
+            now = time.monotonic()
+            if pending and (now - last_flush >= self.flush_interval or len(pending) >= 4096):
+                self._flush(pending)
+                pending, last_flush = [], now
+        self._flush(pending + [partial])
+
+    def _flush(self, lines):
+        rows = parse_lines(line.decode("utf-8", "replace") for line in lines)
+        self.buffer.extend(rows)
+        self.received += len(rows)
+
+    def _chunks(self):
+        """Raw bytes from the source; an empty chunk means "nothing new yet"."""
+        if self.source.startswith("tcp://"):
+            yield from self._socket_chunks()
+        elif self.source == "-":
+            yield from self._stream_chunks(sys.stdin.buffer)
+        elif stat.S_ISFIFO(os.stat(self.source).st_mode):
+            with open(self.source, "rb") as f:  # Returns when the writer closes; _run reopens
+                yield from self._stream_chunks(f)
+        else:
+            yield from self._tail_chunks()
+
+    def _socket_chunks(self):
+        host, _, port = self.source[len("tcp://"):].rpartition(":")
+        with socket.create_connection((host or "localhost", int(port)), timeout=5.0) as sock:
+            sock.settimeout(self.flush_interval)
+            while not self._stop.is_set():
+                try:
+                    data = sock.recv(65536)
+                except socket.timeout:
+                    yield b""
+                    continue
+                if not data:
+                    raise ConnectionError("feed closed the connection")
+                yield data
+
+    def _stream_chunks(self, f):
+        while not self._stop.is_set():
+            data = f.read1(65536)
+            if not data:
+                return
+            yield data
+
+    def _tail_chunks(self):
+        with open(self.source, "rb") as f:
+            while not self._stop.is_set():
+                data = f.read1(65536)
+                if data:
+                    yield data
+                    continue
+                if os.stat(self.source).st_size < f.tell():
+                    return  # Truncated or rotated; _run reopens from the start
+                yield b""
+                self._stop.wait(self.flush_interval)
+
+
+# === Stand-in feed ===
+def feed_lines(step_days=7.0, start=None):
+    """Endless ``time,x,y,z`` lines along Voyager 1's path, continuing outward past the last waypoint."""
+    from Voyager_data import VOYAGER_EVENTS
+    from voyager_trajectory import Trajectory
+
+    trajectory = Trajectory(VOYAGER_EVENTS, method="hermite")
+    velocity = (trajectory.positions[-1] - trajectory.positions[-2]) / (trajectory.times[-1] - trajectory.times[-2])
+    t = trajectory.start if start is None else start
+    step = step_days / 365.25
+    while True:
+        if t <= trajectory.end:
+            x, y, z = trajectory.position_at(t)
+        else:
+            x, y, z = trajectory.positions[-1] + (t - trajectory.end) * velocity
+        yield f"{t:.6f},{x:.6e},{y:.6e},{z:.6e}\n"
+        t += step
+
+
+def _paced(lines, rate):
+    interval = 1.0 / rate
+    next_time = time.monotonic()
+    for line in lines:
+        yield line
+        next_time += interval
+        time.sleep(max(0.0, next_time - time.monotonic()))
+
+
+class _FeedHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # Every client gets its own feed from the start of the mission
+        try:
+            for line in _paced(feed_lines(self.server.step_days), self.server.rate):
+                self.wfile.write(line.encode())
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stand-in telemetry feed for the Voyager viewer")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--serve", type=int, metavar="PORT", help="Serve the feed over TCP on localhost:PORT")
+    output.add_argument("--file", help="Append the feed to this file (or named pipe)")
+    parser.add_argument("--rate", type=float, default=20.0, help="Samples per second")
+    parser.add_argument("--step-days", type=float, default=7.0, help="Mission time between samples, in days")
+    args = parser.parse_args(argv)
+
+    if args.serve is not None:
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        socketserver.ThreadingTCPServer.daemon_threads = True
+        with socketserver.ThreadingTCPServer(("localhost", args.serve), _FeedHandler) as server:
+            server.rate, server.step_days = args.rate, args.step_days
+            print(f"Serving telemetry on tcp://localhost:{args.serve}", file=sys.stderr)
+            server.serve_forever()
+        return
+
+    out = open(args.file, "a", buffering=1) if args.file else sys.stdout
+    try:
+        for line in _paced(feed_lines(args.step_days), args.rate):
+            out.write(line)
+            out.flush()
+    except (BrokenPipeError, KeyboardInterrupt):
+        pass
+
+
+if __name__ == "__main__":
+    main()
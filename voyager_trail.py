@@ -0,0 +1,66 @@
+import numpy as np
+from matplotlib.colors import to_rgba
+
+
+class Trail:
+    """The last ``capacity`` marker positions, kept as line segments ordered by age.
+
+    Positions go into a fixed ``(capacity, 3)`` ring buffer. ``segments``
+    (for 3D) and ``segments_xy`` (for 2D) are rewritten in place, oldest
+    first, on every update. Segment ``k`` always has the same age, so the
+    colours from ``colors`` only change with the theme. Until the ring
+    fills, the unused oldest segments collapse onto the oldest position.
+    """
+
+    def __init__(self, capacity=60):
+        if capacity < 2:
+            raise ValueError("A trail needs room for at least two positions")
+        self.capacity = capacity
+        self._ring = np.zeros((capacity, 3))
+        self._count = 0
+        self._head = 0  # Slot for the next position
+        # _slots[head:head + capacity] lists the ring slots oldest first
+        self._slots = np.arange(2 * capacity) % capacity
+        self._ordered = np.zeros((capacity, 3))
+        self.segments = np.zeros((capacity - 1, 2, 3))
+        self.segments_xy = np.zeros((capacity - 1, 2, 2))
+
+    def __len__(self):
+        return self._count
+
+    def clear(self):
+        self._count = self._head = 0
+        self._refresh()
+
+    def push(self, point):
+        """Append the newest position, dropping the oldest once full."""
+        self._ring[self._head] = point
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self._refresh()
+
+    def reset(self, points):
+        """Replace the contents with ``points`` (oldest first); only the newest ``capacity`` are kept."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)[-self.capacity:]
+        n = len(points)
+        self._ring[:n] = points
+        self._count = n
+        self._head = n % self.capacity
+        self._refresh()
+
+    def _refresh(self):
+        np.take(self._ring, self._slots[self._head:self._head + self.capacity], axis=0, out=self._ordered)
+        unused = self.capacity - self._count
+        if self._count == 0:
+            self._ordered[:] = 0.0
+        elif unused:
+            self._ordered[:unused] = self._ordered[unused]
+        self.segments[:, 0] = self._ordered[:-1]
+        self.segments[:, 1] = self._ordered[1:]
+        self.segments_xy[:] = self.segments[..., :2]
+
+    def colors(self, color):
+        """RGBA per segment: ``color`` fading from transparent (oldest) to opaque (newest)."""
+        rgba = np.tile(to_rgba(color), (self.capacity - 1, 1))
+        rgba[:, 3] = np.linspace(0.0, 1.0, self.capacity)[1:] ** 1.5
+        return rgba
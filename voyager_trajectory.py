@@ -0,0 +1,158 @@
+import numpy as np
+from voyager_ephemeris import event_arrays
+
+
+class Trajectory:
+    """Time-keyed trajectory through a set of waypoints.
+
+    Events are sorted and packed once into a ``times`` vector and an
+    ``(n, 3)`` ``positions`` array. Lookups use ``np.searchsorted`` and work
+    on whole arrays of query times at once.
+
+    ``method`` is ``"linear"`` (piecewise linear) or ``"hermite"`` (cubic
+    Hermite with finite-difference tangents, passing through every waypoint).
+    """
+
+    METHODS = ("linear", "hermite")
+
+    def __init__(self, events, method="linear"):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown interpolation method: {method!r}")
+        if not len(events):
+            raise ValueError("A trajectory needs at least one event.")
+        self.method = method
+
+        times, coords = event_arrays(events)
+
+        if np.all(np.diff(times) > 0):
+            # Already strictly increasing (typical for ephemeris exports)
+            self.times = np.ascontiguousarray(times)
+            self.event_ids = np.arange(len(times))
+            self.positions = np.ascontiguousarray(coords)
+        else:
+            # Sort once; repeated timestamps keep their first event as the knot
+            order = np.argsort(times, kind="stable")
+            self.times, first = np.unique(times[order], return_index=True)
+            self.event_ids = order[first]
+            self.positions = np.ascontiguousarray(coords[self.event_ids])
+
+        self._tangents = self._compute_tangents() if method == "hermite" else None
+        self._boxes = None  # Segment bounding-box tree for time_at, built on first use
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def start(self):
+        return self.times[0]
+
+    @property
+    def end(self):
+        return self.times[-1]
+
+    def _compute_tangents(self):
+        t, p = self.times, self.positions
+        m = np.zeros_like(p)
+        if len(t) < 2:
+            return m
+        m[1:-1] = (p[2:] - p[:-2]) / (t[2:] - t[:-2])[:, None]
+        m[0] = (p[1] - p[0]) / (t[1] - t[0])
+        m[-1] = (p[-1] - p[-2]) / (t[-1] - t[-2])
+        return m
+
+    def segment_index(self, times):
+        """Index ``i`` of the knot interval ``[times[i], times[i + 1]]`` containing each time."""
+        times = np.asarray(times, dtype=np.float64)
+        i = np.searchsorted(self.times, times, side="right") - 1
+        return np.clip(i, 0, max(len(self.times) - 2, 0))
+
+    def position_at(self, times):
+        """Positions for one time or an array of times, clamped to the covered range.
+
+        Returns shape ``(3,)`` for a scalar and ``(m, 3)`` for an array.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        flat = np.clip(times.reshape(-1), self.start, self.end)
+
+        if len(self.times) == 1:
+            out = np.broadcast_to(self.positions[0], (len(flat), 3)).copy()
+            return out.reshape(times.shape + (3,))
+
+        i = self.segment_index(flat)
+        t0, t1 = self.times[i], self.times[i + 1]
+        dt = t1 - t0
+        u = ((flat - t0) / dt)[:, None]
+        p0, p1 = self.positions[i], self.positions[i + 1]
+
+        if self.method == "linear":
+            out = p0 + u * (p1 - p0)
+        else:
+            u2, u3 = u * u, u * u * u
+            h00 = 2 * u3 - 3 * u2 + 1
+            h10 = u3 - 2 * u2 + u
+            h01 = -2 * u3 + 3 * u2
+            h11 = u3 - u2
+            d = dt[:, None]
+            out = (h00 * p0 + h10 * d * self._tangents[i]
+                   + h01 * p1 + h11 * d * self._tangents[i + 1])
+
+        return out.reshape(times.shape + (3,))
+
+    def _build_boxes(self):
+        # Level 0 bounds each segment; every level above merges pairs. Stored root first.
+        a, b = self.positions[:-1], self.positions[1:]
+        lo, hi = np.minimum(a, b), np.maximum(a, b)
+        levels = [(lo, hi)]
+        while len(lo) > 1:
+            pairs = np.arange(0, len(lo), 2)
+            lo, hi = np.minimum.reduceat(lo, pairs), np.maximum.reduceat(hi, pairs)
+            levels.append((lo, hi))
+        return levels[::-1]
+
+    def time_at(self, position):
+        """Time of the closest point on the waypoint polyline to each position.
+
+        Accepts one ``(3,)`` position or an ``(m, 3)`` batch. The whole batch
+        descends a tree of segment bounding boxes together, dropping boxes
+        that cannot hold the closest point, so each query touches about
+        O(log n) segments. For the Hermite method the result is measured
+        against the chords between waypoints.
+        """
+        position = np.asarray(position, dtype=np.float64)
+        queries = position.reshape(-1, 3)
+        if len(self.times) == 1:
+            out = np.full(len(queries), self.start)
+            return out[0] if position.ndim == 1 else out
+        if self._boxes is None:
+            self._boxes = self._build_boxes()
+
+        # Candidate (query, box) pairs, starting from the root
+        qi = np.arange(len(queries))
+        node = np.zeros(len(queries), dtype=np.int64)
+        for lo, hi in self._boxes[1:]:
+            qi = np.repeat(qi, 2)
+            node = (np.repeat(node, 2) * 2) + np.tile([0, 1], len(node))
+            keep = node < len(lo)
+            qi, node = qi[keep], node[keep]
+
+            p, l, h = queries[qi], lo[node], hi[node]
+            near = np.sum(np.maximum(np.maximum(l - p, p - h), 0.0) ** 2, axis=1)
+            far = np.sum(np.maximum(np.abs(p - l), np.abs(p - h)) ** 2, axis=1)
+            bound = np.full(len(queries), np.inf)
+            np.minimum.at(bound, qi, far)  # Every box's far corner bounds the closest distance
+            keep = near <= bound[qi]
+            qi, node = qi[keep], node[keep]
+
+        # Exact closest points on the surviving segments; keep the nearest per query
+        a = self.positions[node]
+        ab = self.positions[node + 1] - a
+        ab2 = np.einsum("ij,ij->i", ab, ab)
+        s = np.clip(np.einsum("ij,ij->i", queries[qi] - a, ab) / np.where(ab2 > 0, ab2, 1.0), 0.0, 1.0)
+        d = queries[qi] - (a + s[:, None] * ab)
+        order = np.lexsort((np.einsum("ij,ij->i", d, d), qi))
+        first = order[np.r_[True, qi[order][1:] != qi[order][:-1]]]
+
+        out = np.empty(len(queries))
+        seg = node[first]
+        out[qi[first]] = self.times[seg] + s[first] * (self.times[seg + 1] - self.times[seg])
+        return out[0] if position.ndim == 1 else out
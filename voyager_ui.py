@@ -1,28 +1,93 @@
-import numpy as np
+import time
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QListWidget, QLabel, QComboBox, QPushButton, QLineEdit, QMessageBox
+    QListWidget, QListWidgetItem, QListView, QLabel, QComboBox, QPushButton, QLineEdit, QMessageBox
 )
-from PyQt5.QtCore import QTimer, Qt
-from voyager_plot import VoyagerPlot
-from Voyager_data import VOYAGER_EVENTS
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QTimer, Qt, pyqtSignal
+from PyQt5.QtGui import QColor
+from voyager_startup import StartupTimer
+from Voyager_data import VOYAGER_EVENTS, companion_craft, load_events
+
+# NumPy, matplotlib and the modules built on them are imported in _build_plot,
+# after the window shell has painted, so they do not delay the first frame.
+
+
+class EventListModel(QAbstractListModel):
+    """Events as "year - name" rows, formatted when shown and fetched into the view in batches.
+
+    ``rows`` is any sequence of event indices (a range for the full list,
+    or a query result), so no per-event item objects are created.
+    """
+
+    BATCH = 1000
+
+    def __init__(self, events, parent=None):
+        super().__init__(parent)
+        self.set_events(events)
+
+    def set_events(self, events, rows=None):
+        self.beginResetModel()
+        self.events = events
+        self.rows = range(len(events)) if rows is None else rows
+        self._loaded = min(self.BATCH, len(self.rows))
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self._loaded < len(self.rows)
+
+    def fetchMore(self, parent):
+        count = min(self.BATCH, len(self.rows) - self._loaded)
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        e = self.events[self.event_at(index.row())]
+        return f"{e['year']} - {e['event']}"
+
+    def event_at(self, row):
+        return int(self.rows[row])
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # Emitted once the plot is built and the animation is running
+    ready = pyqtSignal()
+
+    def __init__(self, events=None, fleet=None, profile=False, trace_path=None, startup=None,
+                 stream=None, stream_window=50_000):
         super().__init__()
+        self.events = VOYAGER_EVENTS if events is None else events
+        self.fleet = companion_craft() if fleet is None else fleet
         self.setWindowTitle("🚀 Voyager 1 Interactive Path Viewer")
         self.setMinimumSize(1000, 600)
         self.dark_mode = True  # Default mode
+        self.frame_interval = 200  # Target animation step interval (ms)
+        self.profile = profile
+        self.trace_path = trace_path
+        self.startup = startup or StartupTimer()
+        self.stream_source = stream
+        self.stream_window = stream_window  # Live samples kept on screen
+        self.reader = None
+        self._pending_dataset = None
+        self._last_tick = None
+        self._frame_cost = 0.0
 
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
-        layout = QHBoxLayout()
-        central_widget.setLayout(layout)
+        self.main_layout = QHBoxLayout()
+        central_widget.setLayout(self.main_layout)
 
         # === Left Plot Area ===
-        self.plot_widget = VoyagerPlot(self)
-        layout.addWidget(self.plot_widget, 2)
+        # A placeholder holds the plot's place until _build_plot replaces it
+        self.plot_widget = None
+        self.plot_placeholder = QLabel("Loading trajectory...")
+        self.plot_placeholder.setAlignment(Qt.AlignCenter)
+        self.main_layout.addWidget(self.plot_placeholder, 2)
 
         # === Right Panel ===
         right_panel = QVBoxLayout()
@@ -36,17 +101,29 @@ class MainWindow(QMainWindow):
         self.theme_btn = QPushButton("🌙 Dark Mode")
         self.theme_btn.clicked.connect(self.toggle_theme)
 
-        # Event list
-        self.event_list = QListWidget()
-        for e in VOYAGER_EVENTS:
-            self.event_list.addItem(f"{e['year']} - {e['event']}")
-        self.event_list.itemClicked.connect(self.event_selected)
+        # Companion craft toggles (coloured once the plot exists)
+        self.craft_list = QListWidget()
+        for name in self.fleet:
+            item = QListWidgetItem(name)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+            self.craft_list.addItem(item)
+        self.craft_list.setMaximumHeight(24 * max(len(self.fleet), 1) + 12)
+        self.craft_list.itemChanged.connect(self.craft_toggled)
+
+        # Event list, backed by a model so large catalogues cost nothing until scrolled into view
+        self.event_model = EventListModel(self.events, self)
+        self.event_list = QListView()
+        self.event_list.setUniformItemSizes(True)
+        self.event_list.setModel(self.event_model)
+        self.event_list.clicked.connect(self.event_selected)
 
         # Search
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Enter Year (e.g., 1990)")
-        self.search_btn = QPushButton("🔍 Search Year")
-        self.search_btn.clicked.connect(self.search_year)
+        self.search_input.setPlaceholderText("1990, 1979-1990 within 5e9, jupiter...")
+        self.search_input.returnPressed.connect(self.search_events)
+        self.search_btn = QPushButton("🔍 Search")
+        self.search_btn.clicked.connect(self.search_events)
 
         # Details
         self.details_label = QLabel("Voyager is moving...\nEvents update automatically.")
@@ -60,10 +137,26 @@ class MainWindow(QMainWindow):
         self.stop_btn.clicked.connect(self.stop_animation)
         self.reset_btn.clicked.connect(self.reset_animation)
 
+        self.trail_btn = QPushButton("☄ Trail")
+        self.trail_btn.setCheckable(True)
+        self.trail_btn.setChecked(True)
+        self.trail_btn.toggled.connect(self.toggle_trail)
+
+        self.profile_btn = QPushButton("📈 Performance HUD")
+        self.profile_btn.setCheckable(True)
+        self.profile_btn.toggled.connect(self.toggle_profiler)
+
+        self.live_btn = QPushButton("📡 Live Feed")
+        self.live_btn.setCheckable(True)
+        self.live_btn.toggled.connect(self.toggle_stream)
+
         # Add widgets to panel
         right_panel.addWidget(QLabel("View Mode:"))
         right_panel.addWidget(self.view_selector)
         right_panel.addWidget(self.theme_btn)
+        if self.fleet:
+            right_panel.addWidget(QLabel("Other Spacecraft:"))
+            right_panel.addWidget(self.craft_list)
         right_panel.addWidget(QLabel("Mission Events:"))
         right_panel.addWidget(self.event_list)
         right_panel.addWidget(QLabel("Details:"))
@@ -71,65 +164,232 @@ class MainWindow(QMainWindow):
         right_panel.addWidget(self.start_btn)
         right_panel.addWidget(self.stop_btn)
         right_panel.addWidget(self.reset_btn)
-        right_panel.addWidget(QLabel("Search Voyager by Year:"))
+        right_panel.addWidget(self.trail_btn)
+        right_panel.addWidget(self.profile_btn)
+        if self.stream_source:
+            right_panel.addWidget(self.live_btn)
+        right_panel.addWidget(QLabel("Search by Year, Range or Name:"))
         right_panel.addWidget(self.search_input)
         right_panel.addWidget(self.search_btn)
         right_panel.addStretch()
-        layout.addLayout(right_panel, 1)
 
-        # Timer
+        # Controls act on the plot, so they stay disabled until it exists
+        self.controls = QWidget()
+        self.controls.setLayout(right_panel)
+        self.controls.setEnabled(False)
+        self.main_layout.addWidget(self.controls, 1)
+
+        # Timers; the animation starts once the plot is built
         self.timer = QTimer()
         self.timer.timeout.connect(self.animate_voyager)
-        self.timer.start(200)
+        self.hud_timer = QTimer()
+        self.hud_timer.timeout.connect(self.update_hud)
+        self.stream_timer = QTimer()
+        self.stream_timer.timeout.connect(self.poll_stream)
 
         # Apply initial theme
         self.apply_theme()
+        self.startup.mark("window shell")
+
+        # Build the plot on the first event-loop pass, after the shell is on screen
+        QTimer.singleShot(0, self._build_plot)
+
+    def _build_plot(self):
+        """Import the plotting stack and build the canvas, index and background workers."""
+        if self.isVisible():
+            self.repaint()
+            self.startup.mark("shell painted")
+
+        from voyager_catalog import EventCatalog
+        from voyager_index import SpatialEventIndex
+        from voyager_plot import VoyagerPlot
+        from voyager_profiler import FrameProfiler
+        from voyager_worker import FramePrefetcher, TaskRunner
+        self.startup.mark("import numpy/matplotlib")
+
+        # Spatial index for the per-frame "nearby event" lookup; catalog for searches
+        self.event_index = SpatialEventIndex(self.events, radius=1e9)
+        self.catalog = EventCatalog(self.events)
+
+        # The 3D axes are built here, on first use, with the canvas
+        self.plot_widget = VoyagerPlot(self, events=self.events, fleet=self.fleet)
+        self.main_layout.replaceWidget(self.plot_placeholder, self.plot_widget)
+        self.plot_placeholder.deleteLater()
+        self.craft_list.blockSignals(True)  # A colour change is not a toggle
+        for row in range(self.craft_list.count()):
+            self.craft_list.item(row).setForeground(QColor(self.plot_widget.craft_color(row + 1)))
+        self.craft_list.blockSignals(False)
+        self.startup.mark("build 3D plot")
+
+        # Background work: dataset loads and a frame-ahead buffer for the animation
+        self.tasks = TaskRunner(self)
+        self.tasks.progress.connect(self.show_progress)
+        self.tasks.failed.connect(self.load_failed)
+        self.prefetcher = FramePrefetcher(self.plot_widget.fleet_path, self.event_index, start=1)
+
+        # Frame-time profiler and its overlay on the plot
+        self.profiler = FrameProfiler(enabled=self.profile or self.trace_path is not None)
+        self.plot_widget.profiler = self.profiler
+        self.hud = QLabel(self.plot_widget)
+        self.hud.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 170); color: #00f5d4;"
+            "font-family: monospace; font-size: 11px; padding: 4px; border-radius: 4px;"
+        )
+        self.hud.move(8, 8)
+        self.profile_btn.setChecked(self.profiler.enabled)
+        self.toggle_profiler(self.profiler.enabled)
+
+        self.controls.setEnabled(True)
+        self.timer.start(self.frame_interval)
+        self.startup.mark("interactive")
+        self.ready.emit()
+
+        # Build the other view once the event loop is idle so the first switch is instant
+        QTimer.singleShot(0, lambda: self.plot_widget.prepare_mode("2D"))
+        if self._pending_dataset is not None:
+            self.load_dataset(*self._pending_dataset)
+        if self.stream_source:
+            self.live_btn.setChecked(True)
 
     # === Animation Controls ===
-    def start_animation(self): self.timer.start(200)
+    def start_animation(self):
+        self._last_tick = None
+        self.timer.start(self.frame_interval)
     def stop_animation(self): self.timer.stop()
     def reset_animation(self):
-        self.plot_widget.current_index = 0
-        self.plot_widget.plot_trajectory()
+        self.plot_widget.show_step(0)
+        self.prefetcher.seek(1)
 
     def animate_voyager(self):
-        self.plot_widget.move_forward()
-        x, y, z = self.plot_widget.get_current_position()
-        for e in VOYAGER_EVENTS:
-            ex, ey, ez = e["coords"]
-            dist = np.sqrt((x - ex) ** 2 + (y - ey) ** 2 + (z - ez) ** 2)
-            if dist < 1e9:
-                self.details_label.setText(
-                    f"Year: {e['year']}\nEvent: {e['event']}\nPosition: ({x:.2e}, {y:.2e}, {z:.2e}) km"
-                )
-                return
+        # A late tick drops the frames it missed instead of playing them back slowly
+        now = time.perf_counter()
+        steps = 1
+        if self._last_tick is not None:
+            steps = max(1, round((now - self._last_tick) * 1000 / self.frame_interval))
+        self._last_tick = now
+
+        # Positions and event matches come precomputed; this thread only moves the marker
+        with self.profiler.stage("compute"):
+            self.prefetcher.skip(steps - 1)
+            frame = self.prefetcher.pop()
+        if frame is None:
+            with self.profiler.stage("lookup"):
+                frame = self.prefetcher.compute(self.plot_widget.current_index + steps)
+            self.prefetcher.seek(frame[0] + 1)
+        step, positions, i = frame
+
+        self.plot_widget.show_step(step)
+        with self.profiler.stage("details"):
+            self.show_details(positions[0], i)
+        self.profiler.end_frame()
+        self.adapt_timer((time.perf_counter() - now) * 1000)
+
+    def show_details(self, position, i):
+        x, y, z = position
+        if i >= 0:
+            e = self.events[i]
+            self.details_label.setText(
+                f"Year: {e['year']}\nEvent: {e['event']}\nPosition: ({x:.2e}, {y:.2e}, {z:.2e}) km"
+            )
+            return
         self.details_label.setText(f"Voyager position:\n({x:.2e}, {y:.2e}, {z:.2e}) km")
 
+    def adapt_timer(self, cost_ms):
+        """Stretch the timer interval when frames cost more than the target interval."""
+        self._frame_cost = 0.8 * self._frame_cost + 0.2 * cost_ms
+        interval = int(max(self.frame_interval, self._frame_cost * 1.25))
+        if self.timer.isActive() and abs(interval - self.timer.interval()) > 1:
+            self.timer.setInterval(interval)
+
+    # === Profiler ===
+    def toggle_profiler(self, enabled):
+        self.profiler.enabled = enabled or self.trace_path is not None
+        self.hud.setVisible(enabled)
+        if enabled:
+            self.update_hud()
+            self.hud_timer.start(500)
+        else:
+            self.hud_timer.stop()
+
+    def update_hud(self):
+        self.hud.setText(self.profiler.summary())
+        self.hud.adjustSize()
+        self.hud.raise_()
+
+    # === Live Feed ===
+    def toggle_stream(self, live):
+        """Switch between the live telemetry feed and step playback."""
+        from voyager_stream import TelemetryBuffer, TelemetryReader
+        for widget in (self.start_btn, self.stop_btn, self.reset_btn, self.search_btn):
+            widget.setEnabled(not live)
+        if live:
+            self.timer.stop()
+            self.telemetry = TelemetryBuffer(self.stream_window)
+            self.reader = TelemetryReader(self.stream_source, self.telemetry).start()
+            self._stream_version = 0
+            self.plot_widget.start_stream()
+            self.statusBar().showMessage(f"Waiting for {self.stream_source}...")
+            self.stream_timer.start(100)
+        else:
+            self.stream_timer.stop()
+            self.reader.stop()
+            self.reader = None
+            self.plot_widget.stop_stream()
+            self.statusBar().clearMessage()
+            self.start_animation()
+
+    def poll_stream(self):
+        # Redraw only when the reader thread has appended a batch since the last poll
+        version = self.telemetry.version
+        if version == self._stream_version:
+            if self.reader.error:
+                self.statusBar().showMessage(f"Live feed: {self.reader.error} (retrying)")
+            return
+        self._stream_version = version
+
+        with self.profiler.stage("compute"):
+            samples = self.telemetry.snapshot()
+        self.plot_widget.update_stream(samples)
+        t, x, y, z = samples[-1]
+        with self.profiler.stage("details"):
+            self.details_label.setText(f"Live: {t:.4f}\nPosition: ({x:.2e}, {y:.2e}, {z:.2e}) km")
+            self.statusBar().showMessage(f"Live feed: {self.reader.received} samples, {len(samples)} shown")
+        self.profiler.end_frame()
+
     # === Search Function ===
-    def search_year(self):
-        year_text = self.search_input.text().strip()
-        if not year_text.isdigit():
-            QMessageBox.warning(self, "Invalid Input", "Please enter a valid year (numbers only).")
+    def search_events(self):
+        """Filter the event list by year range, distance and name; a lone year also shows the position."""
+        from voyager_catalog import parse_query
+        query = parse_query(self.search_input.text())
+        year = query.pop("year")
+        if not any(query.values()) and year is None:
+            self.event_model.set_events(self.events)
+            self.statusBar().clearMessage()
             return
-        year = int(year_text)
-        sorted_events = sorted(VOYAGER_EVENTS, key=lambda e: e["year"])
-        years = [e["year"] for e in sorted_events]
-        if year < years[0] or year > years[-1]:
+
+        rows = self.catalog.query(**query)
+        self.event_model.set_events(self.events, rows)
+        self.statusBar().showMessage(f"{len(rows)} matching events", 5000)
+        if year is not None and query["text"] is None and query["within"] is None:
+            self.search_year(year)
+
+    def search_year(self, year):
+        trajectory = self.plot_widget.trajectory
+        if year < trajectory.start or year > trajectory.end:
             QMessageBox.information(self, "No Data", f"No data available for year {year}.")
             return
 
-        for i in range(len(sorted_events) - 1):
-            y0, y1 = sorted_events[i]["year"], sorted_events[i + 1]["year"]
-            if y0 <= year <= y1:
-                coords0 = np.array(sorted_events[i]["coords"])
-                coords1 = np.array(sorted_events[i + 1]["coords"])
-                t = (year - y0) / (y1 - y0)
-                pos = coords0 + t * (coords1 - coords0)
-                event_before = sorted_events[i]["event"]
-                event_after = sorted_events[i + 1]["event"]
-                break
-
-        self.plot_widget.show_event(pos)
+        pos = trajectory.position_at(year)
+        waypoints = self.plot_widget.waypoints
+        i = int(waypoints.segment_index(year))
+        j = min(i + 1, len(waypoints) - 1)
+        y0, y1 = int(waypoints.times[i]), int(waypoints.times[j])
+        event_before = self.events[waypoints.event_ids[i]]["event"]
+        event_after = self.events[waypoints.event_ids[j]]["event"]
+        nearest = self.events[self.catalog.nearest_year(year)]
+
+        self.plot_widget.show_time(year)
+        self.prefetcher.seek(self.plot_widget.current_index + 1)
         QMessageBox.information(
             self,
             f"Voyager Position - {year}",
@@ -137,26 +397,96 @@ class MainWindow(QMainWindow):
             f"X: {pos[0]:.2e} km\n"
             f"Y: {pos[1]:.2e} km\n"
             f"Z: {pos[2]:.2e} km\n\n"
-            f"Between events:\n- {y0}: {event_before}\n- {y1}: {event_after}"
+            f"Between events:\n- {y0}: {event_before}\n- {y1}: {event_after}\n\n"
+            f"Nearest event: {nearest['year']} - {nearest['event']}"
         )
 
     # === Event Selection ===
-    def event_selected(self, item):
-        text = item.text()
-        year = int(text.split(" - ")[0])
-        for e in VOYAGER_EVENTS:
-            if e["year"] == year:
-                self.plot_widget.show_event(e["coords"])
-                self.details_label.setText(
-                    f"Year: {e['year']}\nEvent: {e['event']}\nPosition: {e['coords']}"
-                )
-                break
+    def event_selected(self, index):
+        e = self.events[self.event_model.event_at(index.row())]
+        self.plot_widget.show_time(e["year"])
+        self.prefetcher.seek(self.plot_widget.current_index + 1)
+        self.details_label.setText(
+            f"Year: {e['year']}\nEvent: {e['event']}\nPosition: {e['coords']}"
+        )
+
+    # === Dataset Loading ===
+    def load_dataset(self, path, cache_dir=None, propagate=False):
+        """Load an ephemeris in the background; the current data stays animated meanwhile.
+
+        With ``propagate`` Voyager 1 follows the N-body propagation of the
+        loaded events (or the built-in ones if ``path`` is None); the events
+        themselves stay the waypoints.
+        """
+        if self.plot_widget is None:
+            self._pending_dataset = (path, cache_dir, propagate)  # Picked up by _build_plot
+            return
+        self._pending_dataset = None
+        self.statusBar().showMessage("Propagating trajectory..." if propagate else f"Loading {path}...")
+        self.tasks.submit(
+            lambda progress: self._prepare_dataset(path, cache_dir, propagate, progress), self._apply_dataset
+        )
+
+    def _prepare_dataset(self, path, cache_dir, propagate, progress):
+        # Runs on the worker thread: no widget or matplotlib access here
+        from voyager_catalog import EventCatalog
+        from voyager_index import SpatialEventIndex
+        from voyager_scene import prepare_data
+        progress("Reading ephemeris", 0.0)
+        events = load_events(path, cache_dir=cache_dir)
+        track = None
+        if propagate:
+            from voyager_propagate import propagate_events
+            track = propagate_events(events, cache_dir=cache_dir, progress=progress)
+        data = prepare_data(
+            events, self.fleet, self.plot_widget.interpolation, self.plot_widget.num_steps, progress, track
+        )
+        progress("Indexing events", 0.8)
+        return data, SpatialEventIndex(events, radius=1e9), EventCatalog(events)
+
+    def _apply_dataset(self, result):
+        from voyager_worker import FramePrefetcher
+        data, event_index, catalog = result
+        self.prefetcher.stop()
+        self.events = data["events"]
+        self.event_index = event_index
+        self.catalog = catalog
+        self.plot_widget.set_data(data)
+        self.prefetcher = FramePrefetcher(self.plot_widget.fleet_path, self.event_index, start=1)
+        for row in range(self.craft_list.count()):
+            self.craft_list.item(row).setCheckState(Qt.Checked)
+        self.event_model.set_events(self.events)
+        self.statusBar().showMessage(f"Loaded {len(self.events)} events", 5000)
+
+    def show_progress(self, text, fraction):
+        self.statusBar().showMessage(f"{text}... {fraction:.0%}")
+
+    def load_failed(self, message):
+        self.statusBar().clearMessage()
+        QMessageBox.warning(self, "Load Failed", message)
+
+    def closeEvent(self, event):
+        if self.reader is not None:
+            self.reader.stop()
+        if self.plot_widget is not None:
+            if self.trace_path is not None:
+                self.profiler.dump(self.trace_path)
+            self.prefetcher.stop()
+            self.tasks.shutdown()
+        super().closeEvent(event)
+
+    # === Fleet Toggle ===
+    def craft_toggled(self, item):
+        self.plot_widget.set_craft_enabled(item.text(), item.checkState() == Qt.Checked)
 
     # === View Change ===
     def change_view(self):
         mode = "3D" if self.view_selector.currentText() == "3D View" else "2D"
         self.plot_widget.set_mode(mode)
 
+    def toggle_trail(self, enabled):
+        self.plot_widget.set_trail(enabled)
+
     # === Theme Toggle ===
     def toggle_theme(self):
         self.dark_mode = not self.dark_mode
@@ -172,7 +502,7 @@ class MainWindow(QMainWindow):
                     background-color: #121212;
                     color: #ffffff;
                 }
-                QListWidget, QLineEdit, QComboBox {
+                QListWidget, QListView, QLineEdit, QComboBox {
                     background-color: #1e1e1e;
                     color: #ffffff;
                     border: 1px solid #333;
@@ -200,7 +530,7 @@ class MainWindow(QMainWindow):
                     background-color: #f2f2f2;
                     color: #000000;
                 }
-                QListWidget, QLineEdit, QComboBox {
+                QListWidget, QListView, QLineEdit, QComboBox {
                     background-color: #ffffff;
                     color: #000000;
                     border: 1px solid #aaa;
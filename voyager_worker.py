@@ -0,0 +1,144 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class TaskRunner(QObject):
+    """Runs long jobs (dataset loads, trajectory rebuilds) off the GUI thread.
+
+    ``submit(fn, on_done)`` calls ``fn(progress)`` on a worker thread, where
+    ``progress(text, fraction)`` reports a stage. Progress, results and
+    errors are delivered to the GUI thread through queued Qt signals, so
+    ``on_done(result)`` may touch widgets.
+    """
+
+    progress = pyqtSignal(str, float)
+    failed = pyqtSignal(str)
+    _finished = pyqtSignal(object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="voyager-task")
+        self._finished.connect(self._deliver)
+
+    def submit(self, fn, on_done):
+        def run():
+            try:
+                result = fn(self.progress.emit)
+            except Exception as exc:
+                self.failed.emit(str(exc))
+                return
+            self._finished.emit(on_done, result)
+        return self._executor.submit(run)
+
+    def _deliver(self, on_done, result):
+        on_done(result)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class FramePrefetcher:
+    """Fixed-size ring buffer of upcoming animation frames, filled by a background thread.
+
+    A frame is an animation step, the position of every craft at that step
+    and the index of the nearest event to the primary craft (-1 for none).
+    The worker stays up to ``capacity`` frames ahead of the consumer,
+    computing ``batch`` frames at a time. The GUI thread only pops.
+    """
+
+    def __init__(self, fleet_path, event_index, capacity=256, batch=32, start=0):
+        self.fleet_path = fleet_path
+        self.event_index = event_index
+        self.num_steps = len(fleet_path)
+        self.capacity = capacity
+        self.batch = batch
+
+        self._steps = np.zeros(capacity, dtype=np.int64)
+        self._events = np.zeros(capacity, dtype=np.int64)
+        self._positions = np.zeros((capacity,) + fleet_path.shape[1:])
+        self._head = 0
+        self._count = 0
+        self._next_step = start % self.num_steps
+        self._generation = 0
+        self._stopped = False
+        self._cond = threading.Condition()
+
+        self._thread = threading.Thread(target=self._run, name="voyager-prefetch", daemon=True)
+        self._thread.start()
+
+    def __len__(self):
+        return self._count
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped and self._count >= self.capacity:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                n = min(self.batch, self.capacity - self._count)
+                start, generation = self._next_step, self._generation
+
+            # Heavy part runs without the lock
+            steps = (start + np.arange(n)) % self.num_steps
+            positions = self.fleet_path[steps]
+            events = np.array([self._nearest(p) for p in positions[:, 0]], dtype=np.int64)
+
+            with self._cond:
+                if generation != self._generation:
+                    continue  # A seek happened meanwhile; drop the stale batch
+                slots = (self._head + self._count + np.arange(n)) % self.capacity
+                self._steps[slots] = steps
+                self._events[slots] = events
+                self._positions[slots] = positions
+                self._count += n
+                self._next_step = (start + n) % self.num_steps
+
+    def _nearest(self, point):
+        i = self.event_index.nearest(point)
+        return -1 if i is None else i
+
+    def pop(self):
+        """Next ``(step, positions, event)`` frame, or None if the worker has fallen behind."""
+        with self._cond:
+            if self._count == 0:
+                return None
+            i = self._head
+            frame = int(self._steps[i]), self._positions[i].copy(), int(self._events[i])
+            self._head = (i + 1) % self.capacity
+            self._count -= 1
+            self._cond.notify_all()
+        return frame
+
+    def skip(self, n):
+        """Drop the next ``n`` frames, prefetched or not."""
+        with self._cond:
+            dropped = min(n, self._count)
+            self._head = (self._head + dropped) % self.capacity
+            self._count -= dropped
+            if dropped < n:
+                self._generation += 1
+                self._next_step = (self._next_step + n - dropped) % self.num_steps
+            self._cond.notify_all()
+
+    def compute(self, step):
+        """Compute one frame synchronously, for underruns."""
+        positions = self.fleet_path[step % self.num_steps]
+        return step % self.num_steps, positions, self._nearest(positions[0])
+
+    def seek(self, step):
+        """Discard buffered frames and continue prefetching from ``step``."""
+        with self._cond:
+            self._generation += 1
+            self._head = 0
+            self._count = 0
+            self._next_step = step % self.num_steps
+            self._cond.notify_all()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)